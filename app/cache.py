@@ -1,38 +1,81 @@
-import json
+from array import array
+from functools import lru_cache
 from uuid import UUID
 
+import msgpack
 from loguru import logger
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
 
-from app.settings import REDIS_URL
+from app.schemas import Unavailabilities
+from app.settings import get_settings
 
+_pool: BlockingConnectionPool | None = None
 _redis: Redis | None = None
 SLOTS_TTL = 60  # 1 minute
+UNAVAILABILITIES_TTL = 30  # venues-ms owns these; short TTL bounds staleness
+POOL_TIMEOUT = 2  # seconds to wait for a free connection before failing
+
+
+def get_redis_pool() -> BlockingConnectionPool:
+    """Process-wide pool, bounded so load spikes queue instead of opening sockets."""
+    global _pool
+    if _pool is None:
+        settings = get_settings()
+        _pool = BlockingConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_max_connections,
+            timeout=POOL_TIMEOUT,
+        )
+    return _pool
 
 
 def get_redis() -> Redis:
     global _redis
     if _redis is None:
-        _redis = Redis.from_url(REDIS_URL, decode_responses=True)
+        _redis = Redis(connection_pool=get_redis_pool())
     return _redis
 
 
+async def close_redis() -> None:
+    """Disconnect the shared pool — called from the app lifespan on shutdown."""
+    global _pool, _redis
+    if _pool is not None:
+        await _pool.disconnect()
+    _pool = _redis = None
+
+
+@lru_cache(maxsize=4096)
 def _slots_key(venue_id: UUID) -> str:
-    return f"slots:{venue_id}"
+    return "slots:" + venue_id.hex
 
 
-async def get_slots_cache(venue_id: UUID) -> list | None:
+@lru_cache(maxsize=4096)
+def _unavailabilities_key(venue_id: UUID) -> str:
+    return "unavail:" + venue_id.hex
+
+
+async def get_slots_cache(venue_id: UUID) -> tuple[str, bytes] | None:
+    """
+    Cached slots as (etag, JSON body), or None on miss.
+    The body is the final response payload; the ETag is stored with it so
+    cache hits never rehash.
+    """
     try:
         data = await get_redis().get(_slots_key(venue_id))
-        return json.loads(data) if data else None
+        if not data:
+            return None
+        etag, body = msgpack.unpackb(data)
+        return etag, body
     except Exception:
         logger.warning("Redis get failed — skipping slots cache", exc_info=True)
         return None
 
 
-async def set_slots_cache(venue_id: UUID, slots: list) -> None:
+async def set_slots_cache(venue_id: UUID, etag: str, body: bytes) -> None:
     try:
-        await get_redis().setex(_slots_key(venue_id), SLOTS_TTL, json.dumps(slots))
+        await get_redis().setex(
+            _slots_key(venue_id), SLOTS_TTL, msgpack.packb([etag, body])
+        )
     except Exception:
         logger.warning("Redis set failed — skipping slots cache", exc_info=True)
 
@@ -42,3 +85,35 @@ async def invalidate_slots_cache(venue_id: UUID) -> None:
         await get_redis().delete(_slots_key(venue_id))
     except Exception:
         logger.warning("Redis invalidate failed for slots cache", exc_info=True)
+
+
+async def get_unavailabilities_cache(venue_id: UUID) -> Unavailabilities | None:
+    try:
+        data = await get_redis().get(_unavailabilities_key(venue_id))
+        if not data:
+            return None
+        starts, ends = msgpack.unpackb(data)
+        return Unavailabilities(starts=array("q", starts), ends=array("q", ends))
+    except Exception:
+        logger.warning(
+            "Redis get failed — skipping unavailabilities cache", exc_info=True
+        )
+        return None
+
+
+async def set_unavailabilities_cache(
+    venue_id: UUID, unavailabilities: Unavailabilities
+) -> None:
+    try:
+        await get_redis().setex(
+            _unavailabilities_key(venue_id),
+            UNAVAILABILITIES_TTL,
+            # Raw int64 buffers — decoding is a memcpy, not a per-int unpack.
+            msgpack.packb(
+                [unavailabilities.starts.tobytes(), unavailabilities.ends.tobytes()]
+            ),
+        )
+    except Exception:
+        logger.warning(
+            "Redis set failed — skipping unavailabilities cache", exc_info=True
+        )
@@ -1,57 +1,52 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from decimal import Decimal
+from datetime import UTC, datetime
+from decimal import ROUND_HALF_UP, Decimal
 from uuid import UUID
 
 from fastapi import HTTPException, status
 from ms_core import CRUD
-from tortoise.transactions import in_transaction
+from pydantic import TypeAdapter
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import Q
 
 from app.models import Booking, BookingStatus
-from app.schemas import BookingFilters, BookingResponse, BookingSlot, BookingStatusUpdate
+from app.schemas import (
+    BookingFilters,
+    BookingResponse,
+    BookingSlot,
+    Unavailabilities,
+    decode_cursor,
+)
 
+# Postgres EXCLUDE constraint rejecting overlapping active bookings per venue
+# (see migrations/models/1_*_booking_overlap_exclusion.py).
+_OVERLAP_CONSTRAINT = "bookings_no_overlap"
 
-def _to_utc(dt: datetime) -> datetime:
-    """Ensure a datetime is UTC-aware, handling both aware and naive inputs."""
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
+_SECONDS_PER_HOUR = Decimal(3600)
+_CENTS = Decimal("0.01")
 
+# Reads select only the columns BookingResponse exposes. Validating a whole page
+# through one adapter avoids per-row model_validate setup on the list paths.
+_RESPONSE_FIELDS = tuple(BookingResponse.model_fields)
+_booking_list_adapter = TypeAdapter(list[BookingResponse])
 
-def _overlaps_unavailabilities(
-    start: datetime,
-    end: datetime,
-    unavailabilities: list[dict],
-) -> bool:
-    """Return True if [start, end) overlaps any unavailability window."""
-    for u in unavailabilities:
-        u_start = _to_utc(datetime.fromisoformat(u["start_datetime"]))
-        u_end = _to_utc(datetime.fromisoformat(u["end_datetime"]))
-        if start < u_end and end > u_start:
-            return True
-    return False
 
+def _booking_conflict() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Booking conflicts with an existing booking for this venue",
+    )
 
-class BookingCRUD(CRUD[Booking, BookingResponse]):  # type: ignore
-    async def _has_db_conflict(
-        self,
-        venue_id: UUID,
-        start: datetime,
-        end: datetime,
-        exclude_id: UUID | None = None,
-    ) -> bool:
-        """Return True if an active booking overlaps the given window."""
-        qs = Booking.filter(
-            venue_id=venue_id,
-            status__in=[BookingStatus.PENDING, BookingStatus.CONFIRMED],
-            start_datetime__lt=end,
-            end_datetime__gt=start,
-        )
-        if exclude_id is not None:
-            qs = qs.exclude(id=exclude_id)
-        return await qs.exists()
 
+def _violated_constraint(exc: IntegrityError) -> str | None:
+    # Tortoise re-raises the driver error inside its except block, so the
+    # asyncpg exception (which names the constraint) is the implicit cause.
+    driver_exc = exc.__cause__ or exc.__context__
+    return getattr(driver_exc, "constraint_name", None)
+
+
+class BookingCRUD(CRUD[Booking, BookingResponse]):  # type: ignore
     async def create_booking(
         self,
         venue_id: UUID,
@@ -62,38 +57,27 @@ class BookingCRUD(CRUD[Booking, BookingResponse]):  # type: ignore
         price_per_hour: Decimal,
         currency: str,
         notes: str | None,
-        unavailabilities: list[dict],
+        unavailabilities: Unavailabilities,
     ) -> BookingResponse:
         """
         Persist a new booking after validating:
-          - no DB conflict with existing active bookings (atomic, locked)
           - no overlap with venue unavailability windows
+          - no overlap with existing active bookings, enforced by the
+            `bookings_no_overlap` exclusion constraint
         """
-        # Check unavailabilities outside the transaction (no DB rows involved)
-        if _overlaps_unavailabilities(start_datetime, end_datetime, unavailabilities):
+        if unavailabilities.overlaps(start_datetime, end_datetime):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Booking overlaps with a venue unavailability period",
             )
 
-        duration_hours = Decimal(
-            str((end_datetime - start_datetime).total_seconds() / 3600)
+        # Whole seconds keep the arithmetic exact — no float/str round-trip.
+        seconds = int((end_datetime - start_datetime).total_seconds())
+        total_price = (price_per_hour * seconds / _SECONDS_PER_HOUR).quantize(
+            _CENTS, rounding=ROUND_HALF_UP
         )
-        total_price = (price_per_hour * duration_hours).quantize(Decimal("0.01"))
-
-        # Atomic check-then-insert: SELECT FOR UPDATE prevents double-booking
-        async with in_transaction():
-            if await Booking.filter(
-                venue_id=venue_id,
-                status__in=[BookingStatus.PENDING, BookingStatus.CONFIRMED],
-                start_datetime__lt=end_datetime,
-                end_datetime__gt=start_datetime,
-            ).select_for_update().exists():
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="Booking conflicts with an existing booking for this venue",
-                )
 
+        try:
             inst = await Booking.create(
                 venue_id=venue_id,
                 venue_owner_id=venue_owner_id,
@@ -105,6 +89,10 @@ class BookingCRUD(CRUD[Booking, BookingResponse]):  # type: ignore
                 currency=currency,
                 notes=notes,
             )
+        except IntegrityError as exc:
+            if _violated_constraint(exc) != _OVERLAP_CONSTRAINT:
+                raise
+            raise _booking_conflict() from None
 
         return BookingResponse.model_validate(inst, from_attributes=True)
 
@@ -114,18 +102,16 @@ class BookingCRUD(CRUD[Booking, BookingResponse]):  # type: ignore
         user_id: UUID | None = None,
         venue_owner_id: UUID | None = None,
     ) -> BookingResponse | None:
+        qs = Booking.filter(id=booking_id)
         if user_id is not None:
-            inst = await Booking.get_or_none(id=booking_id, user_id=user_id)
+            qs = qs.filter(user_id=user_id)
         elif venue_owner_id is not None:
-            inst = await Booking.get_or_none(
-                id=booking_id, venue_owner_id=venue_owner_id
-            )
-        else:
-            inst = await Booking.get_or_none(id=booking_id)
+            qs = qs.filter(venue_owner_id=venue_owner_id)
 
-        if not inst:
+        row = await qs.first().values(*_RESPONSE_FIELDS)
+        if not row:
             return None
-        return BookingResponse.model_validate(inst, from_attributes=True)
+        return BookingResponse.model_validate(row)
 
     async def list_bookings(
         self,
@@ -144,33 +130,56 @@ class BookingCRUD(CRUD[Booking, BookingResponse]):  # type: ignore
         if filters.status is not None:
             qs = qs.filter(status=filters.status)
 
-        offset = (filters.page - 1) * filters.page_size
-        qs = qs.offset(offset).limit(filters.page_size)
+        qs = qs.order_by("-created_at", "-id")
+        if filters.cursor is not None:
+            try:
+                created_at, last_id = decode_cursor(filters.cursor)
+            except ValueError as exc:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)
+                ) from None
+            qs = qs.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=last_id)
+            )
+        else:
+            qs = qs.offset((filters.page - 1) * filters.page_size)
+        qs = qs.limit(filters.page_size)
 
-        bookings = await qs
-        return [
-            BookingResponse.model_validate(b, from_attributes=True) for b in bookings
-        ]
+        rows = await qs.values(*_RESPONSE_FIELDS)
+        return _booking_list_adapter.validate_python(rows)
 
     async def update_booking_status(
         self,
-        booking_id: UUID,
-        payload: BookingStatusUpdate,
+        booking: BookingResponse,
+        new_status: BookingStatus,
     ) -> BookingResponse | None:
-        inst = await Booking.get_or_none(id=booking_id)
-        if not inst:
+        """
+        Compare-and-set the status in a single UPDATE: it only matches while the
+        row still has the status the transition was validated against, so two
+        concurrent PATCHes cannot both apply. Returns None if the row changed
+        (or was deleted) in between.
+        """
+        now = datetime.now(UTC)
+        updated = await Booking.filter(id=booking.id, status=booking.status).update(
+            status=new_status, updated_at=now
+        )
+        if not updated:
             return None
-        inst.status = payload.status  # type: ignore
-        await inst.save(update_fields=["status"])
-        return BookingResponse.model_validate(inst, from_attributes=True)
+        return booking.model_copy(update={"status": new_status, "updated_at": now})
 
     async def list_occupied_slots(self, venue_id: UUID) -> list[BookingSlot]:
         """Return booked time windows for a venue — no user info exposed."""
-        bookings = await Booking.filter(
-            venue_id=venue_id,
-            status__in=[BookingStatus.PENDING, BookingStatus.CONFIRMED],
-        ).only("start_datetime", "end_datetime")
-        return [BookingSlot.model_validate(b, from_attributes=True) for b in bookings]
+        # Covered by idx_bookings_venue_status_start — end_datetime is an INCLUDE
+        # column, so the scan can stay index-only.
+        rows = (
+            await Booking.filter(
+                venue_id=venue_id,
+                status__in=[BookingStatus.PENDING, BookingStatus.CONFIRMED],
+            )
+            .order_by("start_datetime")
+            .values_list("start_datetime", "end_datetime")
+        )
+        return [BookingSlot(start, end) for start, end in rows]
 
     async def delete_booking(self, booking_id: UUID) -> bool:
         return await self.delete_by(id=booking_id)
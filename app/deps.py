@@ -1,21 +1,25 @@
+import asyncio
 from dataclasses import dataclass, field
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from urllib.parse import quote, unquote
 from uuid import UUID
 
 import httpx
+import orjson
 from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
-from app import settings
+from app.cache import get_unavailabilities_cache, set_unavailabilities_cache
+from app.schemas import Unavailabilities
 from app.scopes import BOOKING_SCOPE_DESCRIPTIONS, BookingScope
+from app.settings import get_settings
 
 # ---------------------------------------------------------------------------
 # PaymentsClient — thin async wrapper around payments-ms internal API
 # ---------------------------------------------------------------------------
 
 oauth2_scheme = OAuth2PasswordBearer(
-    tokenUrl=f"{settings.users_ms_url}/auth/token",
+    tokenUrl=f"{get_settings().users_ms_url}/auth/token",
     scopes={
         "venues:read": "Browse and search public venue listings.",
         **BOOKING_SCOPE_DESCRIPTIONS,
@@ -27,14 +31,29 @@ oauth2_scheme = OAuth2PasswordBearer(
 class CurrentUser:
     id: UUID
     username: str
-    scopes: list[str] = field(default_factory=list)
+    scopes: frozenset[str] = field(default_factory=frozenset)
+
+    def __post_init__(self) -> None:
+        self.scopes = frozenset(self.scopes)
 
     @property
     def is_admin(self) -> bool:
         return "admin:scopes" in self.scopes
 
+    @cached_property
+    def traefik_headers(self) -> dict[str, bytes]:
+        """
+        Traefik identity headers forwarded to sibling services.
+        Encoded once per request so httpx sends the bytes as-is on every call.
+        """
+        return {
+            "X-User-Id": str(self.id).encode("ascii"),
+            "X-Username": quote(self.username).encode("ascii"),
+            "X-User-Scopes": " ".join(sorted(self.scopes)).encode("ascii"),
+        }
+
 
-def get_current_user(
+async def get_current_user(
     x_user_id: str = Header(...),
     x_username: str = Header(...),
     x_user_scopes: str = Header(default=""),
@@ -52,9 +71,36 @@ def get_current_user(
             detail="Invalid user identity from gateway",
         ) from None
 
-    scopes = x_user_scopes.split(" ") if x_user_scopes else []
+    scopes = frozenset(x_user_scopes.split())
+    # Most usernames arrive unencoded — only pay for percent-decoding when needed.
+    username = unquote(x_username) if "%" in x_username else x_username
+
+    return CurrentUser(id=user_id, username=username, scopes=scopes)
+
 
-    return CurrentUser(id=user_id, username=unquote(x_username), scopes=scopes)
+@dataclass(frozen=True, slots=True)
+class UserCaps:
+    """Booking capabilities derived once per request from the caller's scopes."""
+
+    is_admin_read: bool
+    is_admin_write: bool
+    is_manager: bool
+    is_reader: bool
+    has_cancel: bool
+
+
+async def get_user_caps(
+    current_user: CurrentUser = Depends(get_current_user),
+) -> UserCaps:
+    scopes = current_user.scopes
+    is_admin = BookingScope.ADMIN in scopes
+    return UserCaps(
+        is_admin_read=is_admin or BookingScope.ADMIN_READ in scopes,
+        is_admin_write=is_admin or BookingScope.ADMIN_WRITE in scopes,
+        is_manager=BookingScope.MANAGE in scopes,
+        is_reader=BookingScope.READ in scopes,
+        has_cancel=BookingScope.CANCEL in scopes,
+    )
 
 
 def require_scopes(*required: str):
@@ -67,14 +113,16 @@ def require_scopes(*required: str):
             ...
     """
 
+    required_set = frozenset(required)
+
     async def _dep(
         current_user: CurrentUser = Depends(get_current_user),
     ) -> CurrentUser:
-        missing = [s for s in required if s not in current_user.scopes]
+        missing = required_set - current_user.scopes
         if missing:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Missing required scopes: {', '.join(missing)}",
+                detail=f"Missing required scopes: {', '.join(sorted(missing))}",
             )
         return current_user
 
@@ -99,6 +147,16 @@ can_manage_booking = require_scopes(BookingScope.MANAGE)
 can_admin_delete_booking = require_scopes(BookingScope.ADMIN_DELETE)
 
 
+_READ_OR_MANAGE_SCOPES = frozenset(
+    {
+        BookingScope.READ,
+        BookingScope.MANAGE,
+        BookingScope.ADMIN,
+        BookingScope.ADMIN_READ,
+    }
+)
+
+
 async def can_read_or_manage_booking(
     current_user: CurrentUser = Depends(get_current_user),
 ) -> CurrentUser:
@@ -108,13 +166,7 @@ async def can_read_or_manage_booking(
     - bookings:manage → venue owner sees bookings for their venues
     - admin:bookings* → admin sees all
     """
-    has_read = BookingScope.READ in current_user.scopes
-    has_manage = BookingScope.MANAGE in current_user.scopes
-    has_admin = (
-        BookingScope.ADMIN in current_user.scopes
-        or BookingScope.ADMIN_READ in current_user.scopes
-    )
-    if not (has_read or has_manage or has_admin):
+    if current_user.scopes.isdisjoint(_READ_OR_MANAGE_SCOPES):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=(
@@ -127,19 +179,37 @@ async def can_read_or_manage_booking(
 
 
 # ---------------------------------------------------------------------------
-# VenuesClient — thin async wrapper around venues-ms internal API
+# Shared upstream HTTP transport — one keep-alive connection pool for all siblings
 # ---------------------------------------------------------------------------
 
+# Fail fast on connect and pool waits; sibling services answer well within 5s.
+_HTTP_TIMEOUT = httpx.Timeout(connect=2.0, read=5.0, write=5.0, pool=2.0)
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=128, max_keepalive_connections=64, keepalive_expiry=30
+)
+
 
 @lru_cache(maxsize=1)
-def _get_venues_http_client() -> httpx.AsyncClient:
+def _get_http_transport() -> httpx.AsyncHTTPTransport:
+    return httpx.AsyncHTTPTransport(retries=1, limits=_HTTP_LIMITS)
+
+
+@lru_cache(maxsize=8)
+def _get_http_client(base_url: str) -> httpx.AsyncClient:
+    """One AsyncClient per sibling base URL, all sharing the same transport."""
     return httpx.AsyncClient(
-        base_url=settings.venues_ms_url,
-        timeout=httpx.Timeout(5.0),
+        base_url=base_url,
+        transport=_get_http_transport(),
+        timeout=_HTTP_TIMEOUT,
         follow_redirects=True,
     )
 
 
+# ---------------------------------------------------------------------------
+# VenuesClient — thin async wrapper around venues-ms internal API
+# ---------------------------------------------------------------------------
+
+
 class VenuesClient:
     """
     Thin async wrapper around the venues-ms internal API.
@@ -148,19 +218,12 @@ class VenuesClient:
 
     @property
     def _client(self) -> httpx.AsyncClient:
-        return _get_venues_http_client()
-
-    def _headers(self, user: CurrentUser) -> dict[str, str]:
-        return {
-            "X-User-Id": str(user.id),
-            "X-Username": quote(user.username),
-            "X-User-Scopes": " ".join(user.scopes),
-        }
+        return _get_http_client(get_settings().venues_ms_url)
 
     async def get_venue(self, venue_id: UUID, user: CurrentUser) -> dict | None:
         """Returns venue dict or None if 404. Raises HTTPException on other errors."""
         resp = await self._client.get(
-            f"/venues/{venue_id}", headers=self._headers(user)
+            f"/venues/{venue_id}", headers=user.traefik_headers
         )
         if resp.status_code == 404:
             return None
@@ -169,42 +232,74 @@ class VenuesClient:
                 status_code=status.HTTP_502_BAD_GATEWAY,
                 detail=f"venues-ms returned {resp.status_code}",
             )
-        return resp.json()
+        return orjson.loads(resp.content)
 
     async def get_unavailabilities(
         self, venue_id: UUID, user: CurrentUser
-    ) -> list[dict]:
-        """Returns list of unavailability windows for the venue."""
+    ) -> Unavailabilities:
+        """
+        Returns the venue's unavailability windows, parsed and sorted.
+        Served from Redis when cached (see UNAVAILABILITIES_TTL).
+        """
+        cached = await get_unavailabilities_cache(venue_id)
+        if cached is not None:
+            return cached
+
         resp = await self._client.get(
-            f"/venues/{venue_id}/unavailabilities", headers=self._headers(user)
+            f"/venues/{venue_id}/unavailabilities", headers=user.traefik_headers
         )
         if resp.status_code >= 400:
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
                 detail=f"venues-ms returned {resp.status_code} for unavailabilities",
             )
-        return resp.json()
+        unavailabilities = Unavailabilities.from_windows(orjson.loads(resp.content))
+        await set_unavailabilities_cache(venue_id, unavailabilities)
+        return unavailabilities
 
-    async def get_by_ids(self, venue_ids: set[UUID], user: CurrentUser) -> list[dict]:
-        """Bulk-fetch venue list items by ID for name enrichment. Fails silently."""
+    async def get_venue_and_unavailabilities(
+        self, venue_id: UUID, user: CurrentUser
+    ) -> tuple[dict | None, Unavailabilities]:
+        """
+        Fetch the venue and its unavailability windows concurrently.
+        A missing venue wins over any unavailabilities error (which venues-ms
+        returns for unknown venues) so callers can still answer 404.
+        """
+        venue, unavailabilities = await asyncio.gather(
+            self.get_venue(venue_id, user),
+            self.get_unavailabilities(venue_id, user),
+            return_exceptions=True,
+        )
+        if isinstance(venue, BaseException):
+            raise venue
+        if venue is None:
+            return None, Unavailabilities()
+        if isinstance(unavailabilities, BaseException):
+            raise unavailabilities
+        return venue, unavailabilities
+
+    async def get_by_ids(
+        self, venue_ids: set[UUID], user: CurrentUser
+    ) -> dict[UUID, str | None]:
+        """Bulk-fetch venue names by ID for enrichment. Fails silently."""
         if not venue_ids:
-            return []
+            return {}
         try:
             params = [("ids", str(vid)) for vid in venue_ids]
             resp = await self._client.get(
-                "/venues/bulk", params=params, headers=self._headers(user)
+                "/venues/bulk", params=params, headers=user.traefik_headers
             )
             if resp.status_code >= 400 or not resp.content:
-                return []
-            return resp.json()
-        except (httpx.RequestError, ValueError):
-            return []
+                return {}
+            return {UUID(v["id"]): v.get("name") for v in orjson.loads(resp.content)}
+        except (httpx.RequestError, ValueError, KeyError):
+            return {}
 
 
 _venues_client = VenuesClient()
 
 
-def get_venues_client() -> VenuesClient:
+async def get_venues_client() -> VenuesClient:
     return _venues_client
 
 
@@ -213,15 +308,6 @@ def get_venues_client() -> VenuesClient:
 # ---------------------------------------------------------------------------
 
 
-@lru_cache(maxsize=1)
-def _get_users_http_client() -> httpx.AsyncClient:
-    return httpx.AsyncClient(
-        base_url=settings.users_ms_url,
-        timeout=httpx.Timeout(5.0),
-        follow_redirects=True,
-    )
-
-
 class UsersClient:
     """
     Thin async wrapper around the users-ms internal API.
@@ -230,35 +316,36 @@ class UsersClient:
 
     @property
     def _client(self) -> httpx.AsyncClient:
-        return _get_users_http_client()
-
-    def _headers(self, user: CurrentUser) -> dict[str, str]:
-        return {
-            "X-User-Id": str(user.id),
-            "X-Username": quote(user.username),
-            "X-User-Scopes": " ".join(user.scopes),
-        }
+        return _get_http_client(get_settings().users_ms_url)
 
-    async def get_by_ids(self, user_ids: set[UUID], user: CurrentUser) -> list[dict]:
-        """Bulk-fetch users by ID for name enrichment. Fails silently."""
+    async def get_by_ids(
+        self, user_ids: set[UUID], user: CurrentUser
+    ) -> dict[UUID, tuple[str | None, str | None]]:
+        """
+        Bulk-fetch users by ID for name enrichment as (username, full_name) pairs.
+        Fails silently.
+        """
         if not user_ids:
-            return []
+            return {}
         try:
             params = [("ids", str(uid)) for uid in user_ids]
             resp = await self._client.get(
-                "/users/bulk", params=params, headers=self._headers(user)
+                "/users/bulk", params=params, headers=user.traefik_headers
             )
             if resp.status_code >= 400 or not resp.content:
-                return []
-            return resp.json()
-        except (httpx.RequestError, ValueError):
-            return []
+                return {}
+            return {
+                UUID(u["id"]): (u.get("username"), u.get("full_name"))
+                for u in orjson.loads(resp.content)
+            }
+        except (httpx.RequestError, ValueError, KeyError):
+            return {}
 
 
 _users_client = UsersClient()
 
 
-def get_users_client() -> UsersClient:
+async def get_users_client() -> UsersClient:
     return _users_client
 
 
@@ -267,15 +354,6 @@ def get_users_client() -> UsersClient:
 # ---------------------------------------------------------------------------
 
 
-@lru_cache(maxsize=1)
-def _get_payments_http_client() -> httpx.AsyncClient:
-    return httpx.AsyncClient(
-        base_url=settings.payments_ms_url,
-        timeout=httpx.Timeout(5.0),
-        follow_redirects=True,
-    )
-
-
 class PaymentsClient:
     """
     Thin async wrapper around payments-ms internal API.
@@ -287,14 +365,7 @@ class PaymentsClient:
 
     @property
     def _client(self) -> httpx.AsyncClient:
-        return _get_payments_http_client()
-
-    def _headers(self, user: CurrentUser) -> dict[str, str]:
-        return {
-            "X-User-Id": str(user.id),
-            "X-Username": quote(user.username),
-            "X-User-Scopes": " ".join(user.scopes),
-        }
+        return _get_http_client(get_settings().payments_ms_url)
 
     async def refund_booking(self, booking_id: UUID, caller: CurrentUser) -> bool:
         """
@@ -304,7 +375,7 @@ class PaymentsClient:
         try:
             resp = await self._client.post(
                 f"/payments/booking/{booking_id}/refund",
-                headers=self._headers(caller),
+                headers=caller.traefik_headers,
             )
             return resp.status_code < 400
         except (httpx.RequestError, Exception):
@@ -314,5 +385,14 @@ class PaymentsClient:
 _payments_client = PaymentsClient()
 
 
-def get_payments_client() -> PaymentsClient:
+async def get_payments_client() -> PaymentsClient:
     return _payments_client
+
+
+async def close_http_clients() -> None:
+    """Close the upstream HTTP clients and their shared transport on shutdown."""
+    if _get_http_client.cache_info().currsize:
+        # Clients delegate aclose() to the shared transport; closing it once suffices.
+        await _get_http_transport().aclose()
+    _get_http_client.cache_clear()
+    _get_http_transport.cache_clear()
@@ -1,15 +1,30 @@
 import asyncio
+from collections.abc import Callable
 from decimal import Decimal
+from hashlib import blake2b
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from loguru import logger
+from pydantic import TypeAdapter
 
 from app.cache import get_slots_cache, invalidate_slots_cache, set_slots_cache
 from app.crud import booking_crud
 from app.deps import (
     CurrentUser,
     PaymentsClient,
+    UserCaps,
     UsersClient,
     VenuesClient,
     can_admin_delete_booking,
@@ -17,6 +32,7 @@ from app.deps import (
     can_write_booking,
     get_current_user,
     get_payments_client,
+    get_user_caps,
     get_users_client,
     get_venues_client,
 )
@@ -28,6 +44,7 @@ from app.schemas import (
     BookingSlot,
     BookingStatus,
     BookingStatusUpdate,
+    encode_cursor,
 )
 from app.scopes import BookingScope
 
@@ -39,84 +56,115 @@ router = APIRouter(prefix="/bookings", tags=["bookings"])
 # ---------------------------------------------------------------------------
 
 
+_NO_NAMES: tuple[None, None] = (None, None)
+
+
 async def _enrich(
-    bookings: list,
+    bookings: list[BookingResponse],
     current_user: CurrentUser,
     venues_client: VenuesClient,
     users_client: UsersClient,
 ) -> list[BookingEnriched]:
     """
-    Convert a list of raw booking objects into BookingEnriched by fetching
+    Extend validated bookings into BookingEnriched by fetching
     venue names and user names from upstream services in parallel.
+    IDs are deduplicated across the page (customers and owners share one set),
+    so each upstream sees exactly one bulk call per request.
     Both upstream calls degrade gracefully — enriched fields become None on error.
     """
     if not bookings:
         return []
 
-    parsed = [BookingResponse.model_validate(b, from_attributes=True) for b in bookings]
+    venue_ids = {b.venue_id for b in bookings}
+    user_ids = {b.user_id for b in bookings} | {b.venue_owner_id for b in bookings}
 
-    venue_ids = {b.venue_id for b in parsed}
-    user_ids = {b.user_id for b in parsed} | {b.venue_owner_id for b in parsed}
-
-    venues_raw, users_raw = await asyncio.gather(
+    venue_map, user_map = await asyncio.gather(
         venues_client.get_by_ids(venue_ids, current_user),
         users_client.get_by_ids(user_ids, current_user),
     )
 
-    venue_map: dict[str, str | None] = {v["id"]: v.get("name") for v in venues_raw}
-    user_map: dict[str, dict] = {
-        u["id"]: {"username": u.get("username"), "full_name": u.get("full_name")}
-        for u in users_raw
-    }
-
-    result = []
-    for b in parsed:
-        customer = user_map.get(str(b.user_id), {})
-        owner = user_map.get(str(b.venue_owner_id), {})
-        result.append(
-            BookingEnriched(
-                **b.model_dump(),
-                venue_name=venue_map.get(str(b.venue_id)),
-                customer_username=customer.get("username"),
-                customer_full_name=customer.get("full_name"),
-                owner_username=owner.get("username"),
-                owner_full_name=owner.get("full_name"),
-            )
+    return [
+        BookingEnriched.from_booking(
+            b,
+            venue_name=venue_map.get(b.venue_id),
+            customer=user_map.get(b.user_id, _NO_NAMES),
+            owner=user_map.get(b.venue_owner_id, _NO_NAMES),
         )
-    return result
+        for b in bookings
+    ]
 
 
 # ---------------------------------------------------------------------------
 # Transition guard helpers
 # ---------------------------------------------------------------------------
 
-_VALID_TRANSITIONS: dict[BookingStatus, set[BookingStatus]] = {
-    BookingStatus.PENDING: {BookingStatus.CONFIRMED, BookingStatus.CANCELLED},
-    BookingStatus.CONFIRMED: {
-        BookingStatus.COMPLETED,
-        BookingStatus.CANCELLED,
-        BookingStatus.NO_SHOW,
-    },
-    BookingStatus.COMPLETED: set(),
-    BookingStatus.CANCELLED: set(),
-    BookingStatus.NO_SHOW: set(),
+_EMPTY_FS: frozenset[BookingStatus] = frozenset()
+
+_VALID_TRANSITIONS: dict[BookingStatus, frozenset[BookingStatus]] = {
+    BookingStatus.PENDING: frozenset(
+        {BookingStatus.CONFIRMED, BookingStatus.CANCELLED}
+    ),
+    BookingStatus.CONFIRMED: frozenset(
+        {BookingStatus.COMPLETED, BookingStatus.CANCELLED, BookingStatus.NO_SHOW}
+    ),
+    BookingStatus.COMPLETED: _EMPTY_FS,
+    BookingStatus.CANCELLED: _EMPTY_FS,
+    BookingStatus.NO_SHOW: _EMPTY_FS,
 }
 
-# Which scope is required (on top of the valid-transition check) per target status
-_MANAGE_STATUSES = {
-    BookingStatus.CONFIRMED,
-    BookingStatus.COMPLETED,
-    BookingStatus.NO_SHOW,
+# Packed form of _VALID_TRANSITIONS for the per-PATCH check: one bit per status.
+_STATUS_BIT: dict[BookingStatus, int] = {s: 1 << i for i, s in enumerate(BookingStatus)}
+_VALID_MASK: dict[BookingStatus, int] = {
+    old: sum(_STATUS_BIT[new] for new in targets)
+    for old, targets in _VALID_TRANSITIONS.items()
+}
+# Allowed targets per status in declaration order, pre-rendered for the 400 detail
+_ALLOWED_LIST: dict[BookingStatus, list[str]] = {
+    old: [s.value for s in BookingStatus if s in targets]
+    for old, targets in _VALID_TRANSITIONS.items()
+}
+
+# Permission policy per target status (checked after the valid-transition mask).
+# Admins bypass it; every other caller must satisfy the status's predicate.
+_PermissionCheck = Callable[[BookingResponse, CurrentUser, UserCaps], bool]
+
+
+def _venue_owner_manages(b: BookingResponse, u: CurrentUser, caps: UserCaps) -> bool:
+    return caps.is_manager and u.id == b.venue_owner_id
+
+
+def _booker_or_owner_cancels(
+    b: BookingResponse, u: CurrentUser, caps: UserCaps
+) -> bool:
+    # Either the customer cancels their own booking, or the venue owner refuses it
+    return (caps.has_cancel and u.id == b.user_id) or _venue_owner_manages(b, u, caps)
+
+
+def _manage_policy(target: BookingStatus) -> tuple[_PermissionCheck, str]:
+    return _venue_owner_manages, (
+        f"Transitioning to '{target}' requires "
+        f"'{BookingScope.MANAGE}' scope and being the venue owner."
+    )
+
+
+_PERMISSION_CHECK: dict[BookingStatus, tuple[_PermissionCheck, str]] = {
+    BookingStatus.CONFIRMED: _manage_policy(BookingStatus.CONFIRMED),
+    BookingStatus.COMPLETED: _manage_policy(BookingStatus.COMPLETED),
+    BookingStatus.NO_SHOW: _manage_policy(BookingStatus.NO_SHOW),
+    BookingStatus.CANCELLED: (
+        _booker_or_owner_cancels,
+        f"Transitioning to '{BookingStatus.CANCELLED}' requires "
+        f"'{BookingScope.CANCEL}' scope as the booking owner, "
+        f"or '{BookingScope.MANAGE}' scope as the venue owner.",
+    ),
 }
-_CANCEL_STATUSES = {BookingStatus.CANCELLED}
 
 
 def _assert_transition(
-    old_status: BookingStatus,
+    booking: BookingResponse,
     new_status: BookingStatus,
-    booking_user_id: UUID,
-    booking_venue_owner_id: UUID,
     current_user: CurrentUser,
+    caps: UserCaps,
 ) -> None:
     """
     Raise HTTP 400/403 if the transition is invalid or the caller lacks permission.
@@ -128,93 +176,101 @@ def _assert_transition(
       confirmed → cancelled  : CANCEL + booker, OR MANAGE + venue owner, OR admin
       confirmed → no_show    : MANAGE + venue owner, OR admin
     """
-    if new_status not in _VALID_TRANSITIONS.get(old_status, set()):
+    old_status = booking.status
+    if not _VALID_MASK.get(old_status, 0) & _STATUS_BIT[new_status]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=(
                 f"Cannot transition from '{old_status}' to '{new_status}'. "
-                "Allowed: "
-                f"{[s.value for s in _VALID_TRANSITIONS.get(old_status, set())]}"
+                f"Allowed: {_ALLOWED_LIST.get(old_status, [])}"
             ),
         )
 
-    is_admin = (
-        BookingScope.ADMIN in current_user.scopes
-        or BookingScope.ADMIN_WRITE in current_user.scopes
-    )
-    if is_admin:
+    if caps.is_admin_write:
         return
 
-    is_venue_owner = current_user.id == booking_venue_owner_id
-    has_manage = BookingScope.MANAGE in current_user.scopes
-
-    if new_status in _MANAGE_STATUSES:
-        if not (has_manage and is_venue_owner):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=(
-                    f"Transitioning to '{new_status}' requires "
-                    f"'{BookingScope.MANAGE}' scope and being the venue owner."
-                ),
-            )
-
-    elif new_status in _CANCEL_STATUSES:
-        is_booker = current_user.id == booking_user_id
-        has_cancel = BookingScope.CANCEL in current_user.scopes
-        # Either the customer cancels their own booking, or the venue owner refuses it
-        if not ((has_cancel and is_booker) or (has_manage and is_venue_owner)):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=(
-                    f"Transitioning to '{new_status}' requires "
-                    f"'{BookingScope.CANCEL}' scope as the booking owner, "
-                    f"or '{BookingScope.MANAGE}' scope as the venue owner."
-                ),
-            )
+    # Every valid target status has a policy entry
+    allowed, detail = _PERMISSION_CHECK[new_status]
+    if not allowed(booking, current_user, caps):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
 
 
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
 
+# Slots change whenever a booking does, so clients always revalidate — the
+# ETag turns an unchanged poll into a bodiless 304 instead of a re-serialization.
+_SLOTS_CACHE_CONTROL = "private, no-cache"
+# BookingSlot is a dataclass orjson encodes natively; UTC renders as "Z" like pydantic
+_SLOTS_JSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC
+
+# Read endpoints serialize through prebuilt adapters straight to JSON bytes;
+# `response_model` stays on the routes for the OpenAPI schema only.
+_enriched_list_adapter = TypeAdapter(list[BookingEnriched])
+_enriched_adapter = TypeAdapter(BookingEnriched)
+
+
+def _json_response(body: bytes, headers: dict[str, str] | None = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _etag(body: bytes) -> str:
+    """Strong ETag derived from the response body — identical bytes, identical tag."""
+    return f'"{blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110): a `W/` prefix is ignored."""
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    )
+
 
 @router.get("/slots", response_model=list[BookingSlot])
 async def get_venue_slots(
     venue_id: UUID,
+    request: Request,
     _: CurrentUser = Depends(get_current_user),
-) -> list[BookingSlot]:
+) -> Response:
     """
     Returns occupied time windows for a venue.
     Any authenticated user can call this — response contains NO user identity.
+    Clients revalidate with If-None-Match and get an empty 304 when unchanged.
+    The JSON body is cached as-is, so hits skip Pydantic entirely.
     """
     cached = await get_slots_cache(venue_id)
     if cached is not None:
         logger.debug("Cache hit for slots: venue_id={}", venue_id)
-        return [BookingSlot(**s) for s in cached]
+        etag, body = cached
+    else:
+        logger.debug("Cache miss for slots: venue_id={}", venue_id)
+        slots = await booking_crud.list_occupied_slots(venue_id)
+        body = orjson.dumps(slots, option=_SLOTS_JSON_OPTIONS)
+        etag = _etag(body)
+        # Inline, not a background task: a deferred SET lands later and widens
+        # the window for overwriting a concurrent invalidation with stale slots
+        await set_slots_cache(venue_id, etag, body)
 
-    logger.debug("Cache miss for slots: venue_id={}", venue_id)
-    slots = await booking_crud.list_occupied_slots(venue_id)
-    await set_slots_cache(venue_id, [s.model_dump(mode="json") for s in slots])
-    return slots
+    headers = {"ETag": etag, "Cache-Control": _SLOTS_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return _json_response(body, headers)
 
 
 @router.get("/", response_model=list[BookingEnriched])
 async def list_bookings(
-    filters: BookingFilters = Depends(),
+    filters: Annotated[BookingFilters, Query()],
     current_user: CurrentUser = Depends(can_read_or_manage_booking),
+    caps: UserCaps = Depends(get_user_caps),
     venues_client: VenuesClient = Depends(get_venues_client),
     users_client: UsersClient = Depends(get_users_client),
-) -> list[BookingEnriched]:
-    is_admin = (
-        BookingScope.ADMIN in current_user.scopes
-        or BookingScope.ADMIN_READ in current_user.scopes
-    )
-    is_manager = BookingScope.MANAGE in current_user.scopes
-    is_reader = BookingScope.READ in current_user.scopes
-
-    if is_admin:
+) -> Response:
+    if caps.is_admin_read:
         bookings = await booking_crud.list_bookings(filters=filters)
-    elif is_manager:
+    elif caps.is_manager:
         # Venue owners see bookings for their venues regardless of also having
         # bookings:read (which DEFAULT_OWNER_SCOPES includes for customer use)
         bookings = await booking_crud.list_bookings(
@@ -225,7 +281,13 @@ async def list_bookings(
             filters=filters, user_id=current_user.id
         )
 
-    return await _enrich(bookings, current_user, venues_client, users_client)
+    result = await _enrich(bookings, current_user, venues_client, users_client)
+    response = _json_response(_enriched_list_adapter.dump_json(result))
+    # A full page means there may be more — hand back a keyset cursor for it
+    if len(result) == filters.page_size:
+        last = result[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+    return response
 
 
 @router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
@@ -234,8 +296,10 @@ async def create_booking(
     current_user: CurrentUser = Depends(can_write_booking),
     venues_client: VenuesClient = Depends(get_venues_client),
 ) -> BookingResponse:
-    # 1. Validate venue exists and is ACTIVE
-    venue = await venues_client.get_venue(payload.venue_id, current_user)
+    # 1. Fetch venue + unavailabilities concurrently; validate venue is ACTIVE
+    venue, unavailabilities = await venues_client.get_venue_and_unavailabilities(
+        payload.venue_id, current_user
+    )
     if venue is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -249,11 +313,7 @@ async def create_booking(
             ),
         )
 
-    # 2. Fetch unavailabilities and check for conflicts in CRUD
-    unavailabilities = await venues_client.get_unavailabilities(
-        payload.venue_id, current_user
-    )
-
+    # 2. Check for conflicts in CRUD
     booking = await booking_crud.create_booking(
         venue_id=payload.venue_id,
         venue_owner_id=UUID(venue["owner_id"]),
@@ -273,19 +333,13 @@ async def create_booking(
 async def get_booking(
     booking_id: UUID,
     current_user: CurrentUser = Depends(can_read_or_manage_booking),
+    caps: UserCaps = Depends(get_user_caps),
     venues_client: VenuesClient = Depends(get_venues_client),
     users_client: UsersClient = Depends(get_users_client),
-) -> BookingEnriched:
-    is_admin = (
-        BookingScope.ADMIN in current_user.scopes
-        or BookingScope.ADMIN_READ in current_user.scopes
-    )
-    is_manager = BookingScope.MANAGE in current_user.scopes
-    is_reader = BookingScope.READ in current_user.scopes
-
-    if is_admin:
+) -> Response:
+    if caps.is_admin_read:
         booking = await booking_crud.get_booking(booking_id)
-    elif is_manager:
+    elif caps.is_manager:
         booking = await booking_crud.get_booking(
             booking_id, venue_owner_id=current_user.id
         )
@@ -298,14 +352,16 @@ async def get_booking(
         )
 
     results = await _enrich([booking], current_user, venues_client, users_client)
-    return results[0]
+    return _json_response(_enriched_adapter.dump_json(results[0]))
 
 
 @router.patch("/{booking_id}/status", response_model=BookingResponse)
 async def update_booking_status(
     booking_id: UUID,
     payload: BookingStatusUpdate,
+    background: BackgroundTasks,
     current_user: CurrentUser = Depends(get_current_user),
+    caps: UserCaps = Depends(get_user_caps),
     payments_client: PaymentsClient = Depends(get_payments_client),
 ) -> BookingResponse:
     # Fetch the booking without ownership filter — we validate permissions manually
@@ -315,33 +371,32 @@ async def update_booking_status(
             status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found"
         )
 
-    _assert_transition(
-        old_status=booking.status,
-        new_status=payload.status,
-        booking_user_id=booking.user_id,
-        booking_venue_owner_id=booking.venue_owner_id,
-        current_user=current_user,
-    )
+    _assert_transition(booking, payload.status, current_user, caps)
 
-    updated = await booking_crud.update_booking_status(booking_id, payload)
+    updated = await booking_crud.update_booking_status(booking, payload.status)
     if not updated:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Booking was modified concurrently — reload and retry",
         )
 
     await invalidate_slots_cache(booking.venue_id)
 
     # Trigger Stripe refund when the venue owner (or admin) cancels a paid booking.
     # Customer cancellations do NOT refund — per the no-refund policy for customers.
-    # Failure to refund does not block the cancellation response.
+    # The refund runs after the response is sent, so it never delays (or blocks)
+    # the cancellation.
     if payload.status == BookingStatus.CANCELLED:
-        is_admin = (
-            BookingScope.ADMIN in current_user.scopes
-            or BookingScope.ADMIN_WRITE in current_user.scopes
-        )
         is_venue_owner = current_user.id == booking.venue_owner_id
-        if is_admin or is_venue_owner:
-            await payments_client.refund_booking(booking_id, current_user)
+        if caps.is_admin_write or is_venue_owner:
+            logger.info(
+                "Scheduling refund for cancelled booking {} (by user {})",
+                booking_id,
+                current_user.id,
+            )
+            background.add_task(
+                payments_client.refund_booking, booking_id, current_user
+            )
 
     return updated
 
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import base64
+import binascii
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
 from decimal import Decimal
 from enum import StrEnum
+from itertools import accumulate
 from uuid import UUID
 
+import ciso8601
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
@@ -27,7 +34,7 @@ class BookingCreate(BaseModel):
     def require_timezone(cls, v: datetime) -> datetime:
         if v.tzinfo is None:
             raise ValueError("datetime must be timezone-aware (include UTC offset)")
-        return v.astimezone(timezone.utc)
+        return v.astimezone(UTC)
 
     @model_validator(mode="after")
     def validate_time_range(self) -> BookingCreate:
@@ -55,19 +62,23 @@ class BookingResponse(BaseModel):
     total_price: Decimal
     currency: str
     notes: str | None
+    created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
 
-class BookingSlot(BaseModel):
-    """Minimal occupied slot — reveals no user identity."""
+@dataclass(frozen=True, slots=True)
+class BookingSlot:
+    """
+    Minimal occupied slot — reveals no user identity.
+    A plain slotted dataclass: emitted N times per /slots call and encoded
+    directly by orjson, so it skips pydantic's per-instance overhead.
+    """
 
     start_datetime: datetime
     end_datetime: datetime
 
-    model_config = ConfigDict(from_attributes=True)
-
 
 class BookingEnriched(BookingResponse):
     """BookingResponse extended with human-readable names from upstream services."""
@@ -78,13 +89,93 @@ class BookingEnriched(BookingResponse):
     owner_username: str | None = None
     owner_full_name: str | None = None
 
+    @classmethod
+    def from_booking(
+        cls,
+        booking: BookingResponse,
+        venue_name: str | None,
+        customer: tuple[str | None, str | None],
+        owner: tuple[str | None, str | None],
+    ) -> BookingEnriched:
+        """
+        Extend an already-validated booking without re-running validation —
+        its fields are copied as-is and the upstream names are plain strings.
+        `customer` and `owner` are (username, full_name) pairs.
+        """
+        return cls.model_construct(
+            **dict(booking),
+            venue_name=venue_name,
+            customer_username=customer[0],
+            customer_full_name=customer[1],
+            owner_username=owner[0],
+            owner_full_name=owner[1],
+        )
+
 
 class BookingFilters(BaseModel):
-    """Bind to a FastAPI route via Depends(BookingFilters)."""
+    """Bind to a FastAPI route as `Annotated[BookingFilters, Query()]`."""
 
     venue_id: UUID | None = None
     status: BookingStatus | None = None
 
-    # Pagination
+    # Pagination — `cursor` (from the X-Next-Cursor header) takes precedence
+    # over `page` and seeks by (created_at, id) instead of scanning an OFFSET.
+    # `page` is kept only as a deprecated fallback for existing clients.
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=20, ge=1, le=100)
+    cursor: str | None = None
+
+
+def encode_cursor(created_at: datetime, booking_id: UUID) -> str:
+    """Opaque keyset cursor pointing just past the given booking."""
+    raw = f"{created_at.isoformat()}|{booking_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Inverse of encode_cursor. Raises ValueError on a malformed cursor."""
+    try:
+        created_at, booking_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+        return datetime.fromisoformat(created_at), UUID(booking_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid pagination cursor") from None
+
+
+def _to_epoch(value: str) -> int:
+    """Parse an ISO-8601 string to epoch seconds, treating naive values as UTC."""
+    dt = ciso8601.parse_datetime(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return int(dt.timestamp())
+
+
+@dataclass(frozen=True, slots=True)
+class Unavailabilities:
+    """
+    Venue unavailability windows parsed once into parallel int64 epoch-second
+    arrays (contiguous buffers, no per-element int objects).
+
+    `starts` is sorted ascending; `ends[i]` is the latest end among the first
+    i + 1 windows, so overlapping windows still resolve with a single bisect.
+    """
+
+    starts: array[int] = field(default_factory=lambda: array("q"))
+    ends: array[int] = field(default_factory=lambda: array("q"))
+
+    @classmethod
+    def from_windows(cls, windows: list[dict]) -> Unavailabilities:
+        pairs = sorted(
+            (_to_epoch(w["start_datetime"]), _to_epoch(w["end_datetime"]))
+            for w in windows
+        )
+        return cls(
+            starts=array("q", (s for s, _ in pairs)),
+            ends=array("q", accumulate((e for _, e in pairs), max)),
+        )
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """Return True if [start, end) overlaps any unavailability window."""
+        idx = bisect_left(self.starts, end.timestamp())
+        return idx > 0 and self.ends[idx - 1] > start.timestamp()
@@ -1,7 +1,21 @@
-import os
+from functools import lru_cache
 
-db_url = os.environ.get("DB_URL", "sqlite://:memory:")
-users_ms_url = os.environ.get("USERS_MS_URL", "http://localhost:8000")
-venues_ms_url = os.environ.get("VENUES_MS_URL", "http://localhost:8001")
-payments_ms_url = os.environ.get("PAYMENTS_MS_URL", "http://localhost:8003")
-REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Service configuration — read from the environment (or `.env`) once."""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    db_url: str = "sqlite://:memory:"
+    users_ms_url: str = "http://localhost:8000"
+    venues_ms_url: str = "http://localhost:8001"
+    payments_ms_url: str = "http://localhost:8003"
+    redis_url: str = "redis://localhost:6379/0"
+    redis_max_connections: int = 32
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()
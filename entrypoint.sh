@@ -1,6 +1,12 @@
 #!/bin/sh
 set -e
 
+# `entrypoint.sh migrate` applies pending Aerich migrations and exits. Run it
+# once per deploy (k8s Job / pre-deploy step), never from the serving replicas.
+if [ "${1:-}" = "migrate" ]; then
+  exec uv run aerich upgrade
+fi
+
 # Auto-detect pod CIDR from own IP if FORWARDED_ALLOW_IPS is not set.
 # In k8s, all pods (including Traefik/ingress) share the same pod CIDR,
 # so deriving a /16 from our own IP covers the ingress controller's IP.
@@ -1,3 +1,5 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import uvicorn as uvicorn
@@ -5,8 +7,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from ms_core import setup_app
 
+from app.cache import close_redis
+from app.deps import close_http_clients
 from app.logging import setup_logging
-from app.settings import db_url
+from app.settings import get_settings
 
 setup_logging()
 
@@ -18,6 +22,27 @@ application.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset pagination hands the next cursor back in a header (list_bookings).
+    expose_headers=["X-Next-Cursor"],
 )
 
-tortoise_conf = setup_app(application, db_url, Path("app") / "routers", ["app.models"])
+tortoise_conf = setup_app(
+    application, get_settings().db_url, Path("app") / "routers", ["app.models"]
+)
+
+# Wrap whatever lifespan setup_app installed (DB init/close) so the upstream
+# clients are closed on shutdown after it.
+_setup_lifespan = application.router.lifespan_context
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    async with _setup_lifespan(app):
+        try:
+            yield
+        finally:
+            await close_redis()
+            await close_http_clients()
+
+
+application.router.lifespan_context = _lifespan
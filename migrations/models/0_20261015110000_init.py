@@ -0,0 +1,58 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "bookings" (
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "id" UUID NOT NULL PRIMARY KEY,
+    "venue_id" UUID NOT NULL,
+    "venue_owner_id" UUID NOT NULL,
+    "user_id" UUID NOT NULL,
+    "start_datetime" TIMESTAMPTZ NOT NULL,
+    "end_datetime" TIMESTAMPTZ NOT NULL,
+    "status" VARCHAR(9) NOT NULL DEFAULT 'pending',
+    "price_per_hour" DECIMAL(8,2) NOT NULL,
+    "total_price" DECIMAL(10,2) NOT NULL,
+    "currency" VARCHAR(3) NOT NULL DEFAULT 'EUR',
+    "notes" TEXT,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+COMMENT ON COLUMN "bookings"."status" IS 'PENDING: pending\nCONFIRMED: confirmed\nCOMPLETED: completed\nCANCELLED: cancelled\nNO_SHOW: no_show';
+CREATE TABLE IF NOT EXISTS "aerich" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "version" VARCHAR(255) NOT NULL,
+    "app" VARCHAR(100) NOT NULL,
+    "content" JSONB NOT NULL
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        """
+
+
+MODELS_STATE = (
+    "eJztWG1P2zAQ/itRPoHEELTdxtA0qbQBMrUpgjAQDEVu7LYRjp0lzqBC/PfZTtIkbtrRdj"
+    "A69qVqnruLfc+9OX7QfQoRjrYPKL31yFDf1x50AnzE/6iiLU0HQZALBMBAH0vdfqIkQdCP"
+    "WAhcxvEBwBHiEESRG3oB8yjhKIkxFiB1uWKyagrFxPsRI4fRIWIjFHLB9Q2HPQLRPYqyx+"
+    "DWGXgIw9JuPSjWlrjDxoHEzs/N9qHUFMv1HZfi2Ce5djBmI0om6nHswW1hI2RDRFAIGIIF"
+    "N8QuU48zKNkxB1gYo8lWYQ5ANAAxFmTonwcxcQUHmlxJ/DS+6AvQ41IiqPUIE1w8PCZe5T"
+    "5LVBdLtY6bpxv1D5vSSxqxYSiFkhH9URoCBhJTyWtOpBsi4bYD2DShbS5hno+qSS1bKuTC"
+    "1HQ7+7MMyRmQs5xnWEZzRt9ynOrcB9gjeJxGcA7Httk1zuxm90R44kfRDywpatqGkNQkOl"
+    "bQjSQklNdHUjiTl2gXpn2siUftqmcZauAmevaVLvYEYkYdQu8cAAvJlqEZMVwzD+xPRHht"
+    "LVYnRZs/WS3PH8hVikPljN5x75Zirmj5FvmLo4WJK5i8RcYiBkLmFJvkIi142no92/CatN"
+    "3M7bl9FxG4dDxV2//R/NvR5BXG4mg6jq0RCA0S+zKOJncfEBdV1WdqrUSS0/VcsdMDnkXp"
+    "Cb4cQP3EsNqmdbSvpSrfSatnHZqnXaO9r/EgDrzQR1Cg3ZOOYSeoH2DEJNq0WkanI1HhLc"
+    "YCtXrO2XHvgucCdaIRZ/Fp5y4f3DsYkSEb8cdPczLmW/NUttNPShJYqaAmJOWeGoSei5yA"
+    "z5URjcOKGkSu5wNcXYLTxmoRJtbb6VvWrgTbRsvsNjsbe1s1SSmvNo+hItWNHZVRRhnAjq"
+    "RmQToVy3+Uy92dBch04zBExB1XN5UZ31oFmxdsJcb56QofrOUirz+hyOszi7yuskgoQxV9"
+    "2Ub3rJrCicFS/KVfXK8j7Wzj0i4N0IynjW7zcrM0RDs96yhTL/Da6vQO1LN7AJe8CChbru"
+    "eZ5Z+5CJCbF9dmg9vCfY8A+sC9vQMhdKYktEZn6U6L/JqvIoCAoYyK4FbsMr1LbCLe90d6"
+    "xS1jKtmad8kIcp1Xc8VokhndpfILlieXmu1pwFa7Wlwx1YdilXe13cbHxl79Q2OPq8idTJ"
+    "CPc7LftOzf3Cj+RGEktrTAeCuYvNx0W5HF0nCrvX//hPHGtWYOOCkrd2RRGguQmKqvJ4G7"
+    "OztPIJBrzSRQypSTFiUMkYp59vWMf/dUH7RyE4XIc8IdvIaey7Y07EXs5nXSOodF4fX8Y4"
+    "N6QlCGkXiBODb81fHy+AsDTJbH"
+)
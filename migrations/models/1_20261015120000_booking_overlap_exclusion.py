@@ -0,0 +1,42 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # Refuse to add the constraint over existing double bookings: list every
+    # overlapping active pair so they can be cancelled or moved by hand first.
+    return """
+        DO $$
+        DECLARE
+            conflicts text;
+        BEGIN
+            SELECT string_agg(
+                       format('venue %s: %s overlaps %s', a."venue_id", a."id", b."id"),
+                       E'\\n' ORDER BY a."venue_id", a."start_datetime"
+                   )
+              INTO conflicts
+              FROM "bookings" a
+              JOIN "bookings" b
+                ON b."venue_id" = a."venue_id"
+               AND b."id" > a."id"
+               AND b."start_datetime" < a."end_datetime"
+               AND b."end_datetime" > a."start_datetime"
+             WHERE a."status" IN ('pending', 'confirmed')
+               AND b."status" IN ('pending', 'confirmed');
+            IF conflicts IS NOT NULL THEN
+                RAISE EXCEPTION E'bookings_no_overlap: overlapping bookings:\\n%',
+                    conflicts
+                    USING HINT = 'Cancel or move one booking per pair, then rerun.';
+            END IF;
+        END $$;
+        CREATE EXTENSION IF NOT EXISTS btree_gist;
+        ALTER TABLE "bookings" ADD CONSTRAINT "bookings_no_overlap" EXCLUDE USING gist (
+            "venue_id" WITH =,
+            tstzrange("start_datetime", "end_datetime", '[)') WITH &&
+        ) WHERE ("status" IN ('pending', 'confirmed'));"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "bookings" DROP CONSTRAINT IF EXISTS "bookings_no_overlap";"""
@@ -0,0 +1,17 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_bookings_user_created_id"
+            ON "bookings" ("user_id", "created_at" DESC, "id" DESC);
+        CREATE INDEX IF NOT EXISTS "idx_bookings_owner_created_id"
+            ON "bookings" ("venue_owner_id", "created_at" DESC, "id" DESC);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_bookings_user_created_id";
+        DROP INDEX IF EXISTS "idx_bookings_owner_created_id";"""
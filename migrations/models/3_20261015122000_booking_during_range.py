@@ -0,0 +1,24 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "bookings" ADD COLUMN "during" tstzrange
+            GENERATED ALWAYS AS (tstzrange("start_datetime", "end_datetime", '[)')) STORED;
+        ALTER TABLE "bookings" DROP CONSTRAINT IF EXISTS "bookings_no_overlap";
+        ALTER TABLE "bookings" ADD CONSTRAINT "bookings_no_overlap" EXCLUDE USING gist (
+            "venue_id" WITH =,
+            "during" WITH &&
+        ) WHERE ("status" IN ('pending', 'confirmed'));"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "bookings" DROP CONSTRAINT IF EXISTS "bookings_no_overlap";
+        ALTER TABLE "bookings" ADD CONSTRAINT "bookings_no_overlap" EXCLUDE USING gist (
+            "venue_id" WITH =,
+            tstzrange("start_datetime", "end_datetime", '[)') WITH &&
+        ) WHERE ("status" IN ('pending', 'confirmed'));
+        ALTER TABLE "bookings" DROP COLUMN IF EXISTS "during";"""
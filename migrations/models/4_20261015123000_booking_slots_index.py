@@ -0,0 +1,15 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_bookings_venue_status_start"
+            ON "bookings" ("venue_id", "status", "start_datetime")
+            INCLUDE ("end_datetime");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_bookings_venue_status_start";"""
@@ -5,10 +5,12 @@ No imports needed in test files — pytest discovers this by convention.
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock
+from contextlib import ExitStack
+from functools import cache
+from unittest.mock import patch
 
 import pytest
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.testclient import TestClient
 
 from app.deps import (
@@ -20,33 +22,40 @@ from app.deps import (
     get_users_client,
     get_venues_client,
 )
-from app.routers.booking import router
+from app.schemas import Unavailabilities
 
-from .factories import make_admin, make_customer, make_venue_owner
+from .factories import ADMIN, CUSTOMER, VENUE_OWNER
 
 # ---------------------------------------------------------------------------
-# Default no-op client mocks — prevent real HTTP calls in tests
+# Default no-op clients — prevent real HTTP calls in tests
+#
+# Plain async stubs rather than MagicMocks: nothing asserts on them, and they
+# keep mock bookkeeping off every request a test client makes. Stateless, so
+# one instance of each is shared by every app.
 # ---------------------------------------------------------------------------
 
 
-def _noop_venues_client():
-    mock = MagicMock()
-    mock.get_venue = AsyncMock(return_value=None)
-    mock.get_unavailabilities = AsyncMock(return_value=[])
-    mock.get_by_ids = AsyncMock(return_value=[])
-    return mock
+class _NoopVenuesClient:
+    async def get_venue_and_unavailabilities(self, venue_id, user):
+        return None, Unavailabilities()
 
+    async def get_by_ids(self, venue_ids, user):
+        return {}
 
-def _noop_users_client():
-    mock = MagicMock()
-    mock.get_by_ids = AsyncMock(return_value=[])
-    return mock
 
+class _NoopUsersClient:
+    async def get_by_ids(self, user_ids, user):
+        return {}
 
-def _noop_payments_client():
-    mock = MagicMock()
-    mock.refund_booking = AsyncMock(return_value=True)
-    return mock
+
+class _NoopPaymentsClient:
+    async def refund_booking(self, booking_id, caller):
+        return True
+
+
+_NOOP_VENUES_CLIENT = _NoopVenuesClient()
+_NOOP_USERS_CLIENT = _NoopUsersClient()
+_NOOP_PAYMENTS_CLIENT = _NoopPaymentsClient()
 
 
 # ---------------------------------------------------------------------------
@@ -54,85 +63,230 @@ def _noop_payments_client():
 # ---------------------------------------------------------------------------
 
 
+@cache
+def _router():
+    """
+    Imported on first use so collecting tests that never build an app (schemas,
+    scopes) does not load the router and the ORM/CRUD stack behind it.
+    """
+    from app.routers.booking import router
+
+    return router
+
+
+async def _state_user(request: Request):
+    return request.app.state.current_user
+
+
+def _state_venues_client(request: Request):
+    return request.app.state.venues_client
+
+
+def _state_users_client(request: Request):
+    return request.app.state.users_client
+
+
+def _state_payments_client(request: Request):
+    return request.app.state.payments_client
+
+
+# Every app gets the same overrides; what they return is per-app state.
+_STATE_OVERRIDES = {
+    can_read_or_manage_booking: _state_user,
+    can_write_booking: _state_user,
+    can_admin_delete_booking: _state_user,
+    get_current_user: _state_user,
+    get_venues_client: _state_venues_client,
+    get_users_client: _state_users_client,
+    get_payments_client: _state_payments_client,
+}
+
+
 def build_app(current_user, venues_client=None, users_client=None, payments_client=None) -> FastAPI:
     """
-    Fresh FastAPI app with auth/scope dependencies overridden to return
+    FastAPI app with auth/scope dependencies overridden to return
     `current_user` unconditionally.
 
-    Pass `venues_client` / `users_client` to inject custom mocks.
-    Defaults to no-op mocks that return empty lists, avoiding real HTTP calls.
+    Pass `venues_client` / `users_client` / `payments_client` to inject custom
+    mocks. Defaults are plain no-op stubs, avoiding real HTTP calls: lookups
+    return `{}`, venue fetches `(None, Unavailabilities())`, refunds `True`.
+
+    The overrides read from `app.state`, so a long-lived app can have its
+    user and clients swapped between tests without being rebuilt.
     """
     app = FastAPI()
-    app.include_router(router)
-
-    async def _user():
-        return current_user
-
-    for dep in (
-        can_read_or_manage_booking,
-        can_write_booking,
-        can_admin_delete_booking,
-        get_current_user,
-    ):
-        app.dependency_overrides[dep] = _user
-
-    vc = venues_client if venues_client is not None else _noop_venues_client()
-    uc = users_client if users_client is not None else _noop_users_client()
-    pc = payments_client if payments_client is not None else _noop_payments_client()
-    app.dependency_overrides[get_venues_client] = lambda: vc
-    app.dependency_overrides[get_users_client] = lambda: uc
-    app.dependency_overrides[get_payments_client] = lambda: pc
-
+    app.include_router(_router())
+    app.dependency_overrides.update(_STATE_OVERRIDES)
+    _set_app_state(app, current_user, venues_client, users_client, payments_client)
     return app
 
 
+def _set_app_state(
+    app: FastAPI,
+    current_user,
+    venues_client=None,
+    users_client=None,
+    payments_client=None,
+) -> None:
+    state = app.state
+    state.current_user = current_user
+    state.venues_client = (
+        venues_client if venues_client is not None else _NOOP_VENUES_CLIENT
+    )
+    state.users_client = (
+        users_client if users_client is not None else _NOOP_USERS_CLIENT
+    )
+    state.payments_client = (
+        payments_client if payments_client is not None else _NOOP_PAYMENTS_CLIENT
+    )
+
+
 # ---------------------------------------------------------------------------
 # Reusable client fixtures
 # ---------------------------------------------------------------------------
 
+# Building an app and opening a TestClient per test dominated the handler
+# tests, so each role gets one app and one open client for the whole session.
+# The function-scoped fixtures only put the role's user and the no-op clients
+# back in app.state before handing the shared client out.
 
-@pytest.fixture()
-def customer_client():
-    return TestClient(build_app(make_customer()), raise_server_exceptions=True)
 
+@pytest.fixture(scope="session")
+def _session_clients():
+    """
+    `get(key)` returns the session's open TestClient for `key`, building the
+    app on first use. Callers point it at a user via `_set_app_state`.
+    """
+    with ExitStack() as stack:
+        clients: dict[str, TestClient] = {}
 
-@pytest.fixture()
-def owner_client():
-    return TestClient(build_app(make_venue_owner()), raise_server_exceptions=True)
+        def get(key: str) -> TestClient:
+            client = clients.get(key)
+            if client is None:
+                client = TestClient(build_app(None), raise_server_exceptions=True)
+                clients[key] = stack.enter_context(client)
+            return client
+
+        yield get
+
+
+@pytest.fixture(scope="session")
+def customer_user():
+    return CUSTOMER
+
+
+@pytest.fixture(scope="session")
+def owner_user():
+    return VENUE_OWNER
+
+
+@pytest.fixture(scope="session")
+def admin_user():
+    return ADMIN
+
+
+def _role_client(role: str):
+    @pytest.fixture(name=f"{role}_client")
+    def _fixture(_session_clients, request):
+        client = _session_clients(role)
+        _set_app_state(client.app, request.getfixturevalue(f"{role}_user"))
+        return client
+
+    return _fixture
+
+
+customer_client = _role_client("customer")
+owner_client = _role_client("owner")
+admin_client = _role_client("admin")
+
+
+@pytest.fixture(scope="module")
+def _patched_booking_crud():
+    from app.routers import booking
+
+    # spec= makes every async CRUD method an AsyncMock on first access; the
+    # children are kept across tests, so only their return values get rebound.
+    with patch.object(booking, "booking_crud", spec=booking.booking_crud) as crud:
+        yield crud
 
 
 @pytest.fixture()
-def admin_client():
-    return TestClient(build_app(make_admin()), raise_server_exceptions=True)
+def mock_crud(_patched_booking_crud):
+    """
+    Stand-in for the router's `booking_crud`. The patch is installed once per
+    module; each test gets it back with calls, return values and side effects
+    cleared — set `mock_crud.<method>.return_value` / `.side_effect` as needed.
+    """
+    _patched_booking_crud.reset_mock(return_value=True, side_effect=True)
+    return _patched_booking_crud
+
+
+@pytest.fixture(scope="session")
+def _anon_app_session():
+    app = FastAPI()
+    app.include_router(_router())
+    return app
 
 
 @pytest.fixture()
-def anon_app():
+def anon_app(_anon_app_session):
     """
     Bare app with NO dependency overrides.
     Use this when you want real scope/auth deps to run so you can assert 401/403/422.
+
+    The app itself is shared across the session; overrides a test adds are
+    dropped again on teardown.
     """
-    app = FastAPI()
-    app.include_router(router)
-    return app
+    overrides = _anon_app_session.dependency_overrides
+    snapshot = dict(overrides)
+    yield _anon_app_session
+    overrides.clear()
+    overrides.update(snapshot)
+
+
+@pytest.fixture(scope="session")
+def _anon_session_client(_anon_app_session):
+    with TestClient(_anon_app_session, raise_server_exceptions=True) as client:
+        yield client
 
 
 @pytest.fixture()
-def client_factory():
+def anon_client(anon_app, _anon_session_client):
+    """
+    Open client for `anon_app`. Install any overrides on `anon_app` in the
+    test; they are dropped on teardown like with `anon_app` itself.
+    """
+    return _anon_session_client
+
+
+@pytest.fixture()
+def client_factory(_session_clients):
+    """
+    Client for an arbitrary user and/or custom client mocks.
+
+    Each user gets its own session-scoped client, so clients made for
+    different users in one test stay independent. Making a second client for
+    the same user in a test would re-point the first one and is rejected.
+    """
+    made: set[str] = set()
+
     def _make(
         current_user,
         venues_client=None,
         users_client=None,
         payments_client=None,
     ) -> TestClient:
-        return TestClient(
-            build_app(
-                current_user,
-                venues_client=venues_client,
-                users_client=users_client,
-                payments_client=payments_client,
-            ),
-            raise_server_exceptions=True,
+        key = f"factory:{current_user.id}"
+        assert key not in made, "client_factory: one client per user per test"
+        made.add(key)
+        client = _session_clients(key)
+        _set_app_state(
+            client.app,
+            current_user,
+            venues_client=venues_client,
+            users_client=users_client,
+            payments_client=payments_client,
         )
+        return client
 
     return _make
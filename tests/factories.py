@@ -6,46 +6,75 @@ Import from here in every test file — never define dummy data inline.
 from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from app.deps import CurrentUser
 from app.scopes import BookingScope
 
 # ---------------------------------------------------------------------------
-# Stable IDs — use these when a specific, repeatable UUID is needed.
+# Stable IDs — fixed, valid v4 UUIDs, identical on every run. Use these
+# when a specific, repeatable UUID is needed. The distinguishing digits sit
+# in the first group so derived names like user_dict's username differ.
 # Call uuid4() inline when you need a fresh one per test.
 # ---------------------------------------------------------------------------
 
-CUSTOMER_ID: UUID = uuid4()
-VENUE_OWNER_ID: UUID = uuid4()
-ADMIN_ID: UUID = uuid4()
-OTHER_USER_ID: UUID = uuid4()
+CUSTOMER_ID = UUID("00000001-0000-4000-8000-000000000000")
+VENUE_OWNER_ID = UUID("00000002-0000-4000-8000-000000000000")
+ADMIN_ID = UUID("00000003-0000-4000-8000-000000000000")
+OTHER_USER_ID = UUID("00000004-0000-4000-8000-000000000000")
+OTHER_OWNER_ID = UUID("00000005-0000-4000-8000-000000000000")
 
-BOOKING_ID: UUID = uuid4()
-VENUE_ID: UUID = uuid4()
+BOOKING_ID = UUID("0000000b-0000-4000-8000-000000000000")
+VENUE_ID = UUID("0000000f-0000-4000-8000-000000000000")
 
 NOW = datetime(2026, 6, 1, 10, 0, 0, tzinfo=UTC)
 LATER = NOW + timedelta(hours=2)
 
+# String forms used by the dict factories and as request paths/assertion
+# values in tests, computed once at import.
+_NOW_ISO = NOW.isoformat()
+_LATER_ISO = LATER.isoformat()
+BOOKING_ID_STR = str(BOOKING_ID)
+VENUE_ID_STR = str(VENUE_ID)
+VENUE_OWNER_ID_STR = str(VENUE_OWNER_ID)
+CUSTOMER_ID_STR = str(CUSTOMER_ID)
+BOOKING_URL = f"/bookings/{BOOKING_ID}"
+BOOKING_STATUS_URL = f"{BOOKING_URL}/status"
+
 
 # ---------------------------------------------------------------------------
 # User factories
 # ---------------------------------------------------------------------------
 
 
+# CurrentUser stores scopes as a frozenset; handing it one skips the copy.
+_CUSTOMER_SCOPES = frozenset(
+    {BookingScope.READ, BookingScope.WRITE, BookingScope.CANCEL, "venues:read"}
+)
+_VENUE_OWNER_SCOPES = frozenset({BookingScope.MANAGE, "venues:read"})
+_ADMIN_SCOPES = frozenset(
+    {
+        "admin:scopes",
+        "venues:read",
+        BookingScope.READ,
+        BookingScope.ADMIN,
+        BookingScope.ADMIN_READ,
+        BookingScope.ADMIN_WRITE,
+        BookingScope.ADMIN_DELETE,
+    }
+)
+
+
 def make_customer(
     user_id: UUID = CUSTOMER_ID,
     scopes: list[str] | None = None,
 ) -> CurrentUser:
     """Customer with read/write/cancel booking scopes and venues:read."""
-    if scopes is None:
-        scopes = [
-            BookingScope.READ,
-            BookingScope.WRITE,
-            BookingScope.CANCEL,
-            "venues:read",
-        ]
-    return CurrentUser(id=user_id, username=f"customer_{user_id}", scopes=scopes)
+    return CurrentUser(
+        id=user_id,
+        username=f"customer_{user_id}",
+        scopes=_CUSTOMER_SCOPES if scopes is None else scopes,
+    )
 
 
 def make_venue_owner(
@@ -53,29 +82,23 @@ def make_venue_owner(
     scopes: list[str] | None = None,
 ) -> CurrentUser:
     """Venue owner with manage booking scope and venues:read."""
-    if scopes is None:
-        scopes = [
-            BookingScope.MANAGE,
-            "venues:read",
-        ]
-    return CurrentUser(id=user_id, username=f"owner_{user_id}", scopes=scopes)
+    return CurrentUser(
+        id=user_id,
+        username=f"owner_{user_id}",
+        scopes=_VENUE_OWNER_SCOPES if scopes is None else scopes,
+    )
 
 
 def make_admin() -> CurrentUser:
     """Admin with all admin:bookings:* scopes."""
-    return CurrentUser(
-        id=ADMIN_ID,
-        username="admin",
-        scopes=[
-            "admin:scopes",
-            "venues:read",
-            BookingScope.READ,
-            BookingScope.ADMIN,
-            BookingScope.ADMIN_READ,
-            BookingScope.ADMIN_WRITE,
-            BookingScope.ADMIN_DELETE,
-        ],
-    )
+    return CurrentUser(id=ADMIN_ID, username="admin", scopes=_ADMIN_SCOPES)
+
+
+# Shared default users — neither the app nor the tests mutate a CurrentUser.
+# Call the make_* factories only for a custom id or scope set.
+CUSTOMER = make_customer()
+VENUE_OWNER = make_venue_owner()
+ADMIN = make_admin()
 
 
 # ---------------------------------------------------------------------------
@@ -83,33 +106,50 @@ def make_admin() -> CurrentUser:
 # ---------------------------------------------------------------------------
 
 
+_BOOKING_RESPONSE_BASE = {
+    "id": BOOKING_ID_STR,
+    "venue_id": VENUE_ID_STR,
+    "venue_owner_id": VENUE_OWNER_ID_STR,
+    "user_id": CUSTOMER_ID_STR,
+    "start_datetime": _NOW_ISO,
+    "end_datetime": _LATER_ISO,
+    "status": "pending",
+    "price_per_hour": "20.00",
+    "total_price": "40.00",
+    "currency": "EUR",
+    "notes": None,
+    "created_at": _NOW_ISO,
+    "updated_at": _NOW_ISO,
+}
+
+
 def booking_response(**overrides) -> dict:
-    base = dict(
-        id=str(BOOKING_ID),
-        venue_id=str(VENUE_ID),
-        venue_owner_id=str(VENUE_OWNER_ID),
-        user_id=str(CUSTOMER_ID),
-        start_datetime=NOW.isoformat(),
-        end_datetime=LATER.isoformat(),
-        status="pending",
-        price_per_hour="20.00",
-        total_price="40.00",
-        currency="EUR",
-        notes=None,
-        updated_at=NOW.isoformat(),
-    )
-    return {**base, **overrides}
+    return {**_BOOKING_RESPONSE_BASE, **overrides}
+
+
+_VENUE_BASE = {
+    "id": VENUE_ID_STR,
+    "owner_id": VENUE_OWNER_ID_STR,
+    "name": "Test Court",
+    "status": "active",
+    "price_per_hour": "20.00",
+    "currency": "EUR",
+}
 
 
 def venue_dict(**overrides) -> dict:
     """Minimal venues-ms venue representation used by VenuesClient mocks."""
+    return {**_VENUE_BASE, **overrides}
+
+
+def unavailability_dict(
+    start: datetime = NOW, end: datetime = LATER, **overrides
+) -> dict:
+    """Minimal venues-ms unavailability window used by VenuesClient mocks."""
     base = dict(
-        id=str(VENUE_ID),
-        owner_id=str(VENUE_OWNER_ID),
-        name="Test Court",
-        status="active",
-        price_per_hour="20.00",
-        currency="EUR",
+        start_datetime=start.isoformat(),
+        end_datetime=end.isoformat(),
+        reason=None,
     )
     return {**base, **overrides}
 
@@ -119,25 +159,35 @@ def venue_dict(**overrides) -> dict:
 # ---------------------------------------------------------------------------
 
 
+def _user_base(user_id: UUID) -> dict:
+    user_id_str = str(user_id)
+    return {
+        "id": user_id_str,
+        "username": f"user_{user_id_str[:8]}",
+        "full_name": "Test User",
+        "email": "test@example.com",
+        "is_active": True,
+        "scopes": [],
+        "created_at": _NOW_ISO,
+    }
+
+
+_CUSTOMER_USER_BASE = _user_base(CUSTOMER_ID)
+
+
 def user_dict(user_id: UUID = CUSTOMER_ID, **overrides) -> dict:
     """Minimal users-ms user representation used by UsersClient mocks."""
-    base = dict(
-        id=str(user_id),
-        username=f"user_{str(user_id)[:8]}",
-        full_name="Test User",
-        email="test@example.com",
-        is_active=True,
-        scopes=[],
-        created_at=NOW.isoformat(),
-    )
+    base = _CUSTOMER_USER_BASE if user_id == CUSTOMER_ID else _user_base(user_id)
     return {**base, **overrides}
 
 
+_BOOKING_CREATE_BASE = {
+    "venue_id": VENUE_ID_STR,
+    "start_datetime": _NOW_ISO,
+    "end_datetime": _LATER_ISO,
+    "notes": None,
+}
+
+
 def booking_create_payload(**overrides) -> dict:
-    base = dict(
-        venue_id=str(VENUE_ID),
-        start_datetime=NOW.isoformat(),
-        end_datetime=LATER.isoformat(),
-        notes=None,
-    )
-    return {**base, **overrides}
+    return {**_BOOKING_CREATE_BASE, **overrides}
@@ -3,30 +3,48 @@ Full endpoint test suite for /bookings.
 
 Testing strategy:
   - Auth/scope deps are overridden via conftest.build_app()
-  - CRUD methods are patched per-test with AsyncMock (no DB)
+  - CRUD methods are set per-test on the `mock_crud` fixture with AsyncMock (no DB)
   - VenuesClient is injected as a mock via client_factory(..., venues_client=mock_vc)
 """
 
 from __future__ import annotations
 
+from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from fastapi.testclient import TestClient
+import orjson
+import pytest
 
 from app.deps import get_current_user
-from app.schemas import BookingResponse
+from app.routers import booking as booking_module
+from app.routers.booking import _PERMISSION_CHECK, _VALID_TRANSITIONS
+from app.schemas import (
+    BookingResponse,
+    BookingSlot,
+    BookingStatus,
+    Unavailabilities,
+    decode_cursor,
+    encode_cursor,
+)
 from app.scopes import BookingScope
 
 from .factories import (
     BOOKING_ID,
+    BOOKING_ID_STR,
+    BOOKING_STATUS_URL,
+    BOOKING_URL,
+    CUSTOMER,
     CUSTOMER_ID,
+    LATER,
+    NOW,
+    OTHER_OWNER_ID,
+    OTHER_USER_ID,
     VENUE_ID,
+    VENUE_ID_STR,
     VENUE_OWNER_ID,
     booking_create_payload,
     booking_response,
     make_customer,
-    make_venue_owner,
-    user_dict,
     venue_dict,
 )
 
@@ -36,7 +54,60 @@ def booking_model(**overrides) -> BookingResponse:
     return BookingResponse(**booking_response(**overrides))
 
 
-CRUD_PATH = "app.routers.booking.booking_crud"
+# Shared mock return values — the router only reads them, so one instance each
+# is enough.
+PENDING_BOOKING = booking_model()
+CONFIRMED_BOOKING = booking_model(status="confirmed")
+CANCELLED_BOOKING = booking_model(status="cancelled")
+COMPLETED_BOOKING = booking_model(status="completed")
+
+
+def _venues_client(venue: dict | None) -> MagicMock:
+    mock_vc = MagicMock()
+    mock_vc.get_venue_and_unavailabilities = AsyncMock(
+        return_value=(venue, Unavailabilities())
+    )
+    return mock_vc
+
+
+# VenuesClient mocks keyed by the status of the venue they serve; None means
+# the venue is not found. Tests get them through TestCreateBooking.venue_mock.
+VENUE_CLIENTS = {
+    status: _venues_client(None if status is None else venue_dict(status=status))
+    for status in ("active", "inactive", None)
+}
+
+# Happy-path create body, serialized once; override cases still pass json=.
+CREATE_BODY = orjson.dumps(booking_create_payload())
+JSON_HEADERS = {"content-type": "application/json"}
+
+NO_BOOKING_SCOPE_USER = make_customer(scopes=["venues:read"])
+READ_ONLY_USER = make_customer(scopes=[BookingScope.READ])
+
+# Pending booking of another customer at the owner's venue.
+OTHER_CUSTOMERS_BOOKING = booking_model(user_id=str(OTHER_USER_ID))
+# Pending booking of another customer at a different owner's venue.
+OTHER_VENUES_BOOKING = booking_model(
+    user_id=str(OTHER_USER_ID), venue_owner_id=str(OTHER_OWNER_ID)
+)
+
+# id -> (acting client fixture, stored booking, requested status, expected code)
+TRANSITIONS = {
+    "owner-confirms-pending": ("owner_client", PENDING_BOOKING, "confirmed", 200),
+    "admin-confirms-pending": ("admin_client", PENDING_BOOKING, "confirmed", 200),
+    "customer-cancels-own": ("customer_client", PENDING_BOOKING, "cancelled", 200),
+    "admin-cancels-pending": ("admin_client", PENDING_BOOKING, "cancelled", 200),
+    "owner-refuses-pending": (
+        "owner_client",
+        OTHER_CUSTOMERS_BOOKING,
+        "cancelled",
+        200,
+    ),
+    "owner-completes": ("owner_client", CONFIRMED_BOOKING, "completed", 200),
+    "owner-marks-no-show": ("owner_client", CONFIRMED_BOOKING, "no_show", 200),
+    "from-cancelled-invalid": ("admin_client", CANCELLED_BOOKING, "confirmed", 400),
+    "from-completed-invalid": ("admin_client", COMPLETED_BOOKING, "confirmed", 400),
+}
 
 
 # ---------------------------------------------------------------------------
@@ -45,62 +116,65 @@ CRUD_PATH = "app.routers.booking.booking_crud"
 
 
 class TestListBookings:
-    def test_customer_sees_own_bookings(self, customer_client):
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[booking_response()])
-            resp = customer_client.get("/bookings")
+    @pytest.mark.parametrize(
+        ("client_fixture", "user_id", "venue_owner_id"),
+        [
+            ("customer_client", CUSTOMER_ID, None),  # own bookings only
+            ("owner_client", None, VENUE_OWNER_ID),  # bookings at their venues
+            ("admin_client", None, None),  # no filter — sees all
+        ],
+        ids=["customer", "owner", "admin"],
+    )
+    def test_role_scopes_listing(
+        self, request, mock_crud, client_fixture, user_id, venue_owner_id
+    ):
+        client = request.getfixturevalue(client_fixture)
+        mock_crud.list_bookings.return_value = [PENDING_BOOKING]
+        resp = client.get("/bookings")
         assert resp.status_code == 200
         data = resp.json()
         assert len(data) == 1
-        assert data[0]["id"] == str(BOOKING_ID)
-
-    def test_admin_sees_all_bookings(self, admin_client):
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[booking_response()])
-            resp = admin_client.get("/bookings")
-        assert resp.status_code == 200
-        # Admin path: no user_id or venue_owner_id filter
+        assert data[0]["id"] == BOOKING_ID_STR
         _, kwargs = mock_crud.list_bookings.call_args
-        assert kwargs.get("user_id") is None
-        assert kwargs.get("venue_owner_id") is None
+        assert kwargs.get("user_id") == user_id
+        assert kwargs.get("venue_owner_id") == venue_owner_id
 
-    def test_venue_owner_sees_venue_bookings(self, owner_client):
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[booking_response()])
-            resp = owner_client.get("/bookings")
+    def test_status_filter_forwarded(self, customer_client, mock_crud):
+        mock_crud.list_bookings.return_value = []
+        resp = customer_client.get("/bookings", params={"status": "confirmed"})
         assert resp.status_code == 200
         _, kwargs = mock_crud.list_bookings.call_args
-        assert kwargs.get("venue_owner_id") == VENUE_OWNER_ID
+        assert kwargs["filters"].status == "confirmed"
 
-    def test_customer_user_id_filter_applied(self, client_factory):
-        client = client_factory(make_customer())
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[])
-            resp = client.get("/bookings")
+    def test_full_page_returns_next_cursor(self, customer_client, mock_crud):
+        mock_crud.list_bookings.return_value = [PENDING_BOOKING]
+        resp = customer_client.get("/bookings", params={"page_size": 1})
         assert resp.status_code == 200
-        _, kwargs = mock_crud.list_bookings.call_args
-        assert kwargs.get("user_id") == CUSTOMER_ID
+        assert decode_cursor(resp.headers["X-Next-Cursor"]) == (NOW, BOOKING_ID)
 
-    def test_status_filter_forwarded(self, customer_client):
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[])
-            resp = customer_client.get("/bookings", params={"status": "confirmed"})
+    def test_partial_page_has_no_next_cursor(self, customer_client, mock_crud):
+        mock_crud.list_bookings.return_value = [PENDING_BOOKING]
+        resp = customer_client.get("/bookings")
+        assert "X-Next-Cursor" not in resp.headers
+
+    def test_cursor_forwarded(self, customer_client, mock_crud):
+        cursor = encode_cursor(NOW, BOOKING_ID)
+        mock_crud.list_bookings.return_value = []
+        resp = customer_client.get("/bookings", params={"cursor": cursor})
         assert resp.status_code == 200
         _, kwargs = mock_crud.list_bookings.call_args
-        assert kwargs["filters"].status == "confirmed"
+        assert kwargs["filters"].cursor == cursor
 
-    def test_missing_auth_headers_returns_422(self, anon_app):
-        with TestClient(anon_app) as c:
-            resp = c.get("/bookings")
+    def test_missing_auth_headers_returns_422(self, anon_client):
+        resp = anon_client.get("/bookings")
         assert resp.status_code == 422
 
-    def test_no_relevant_scope_returns_403(self, anon_app):
+    def test_no_relevant_scope_returns_403(self, anon_app, anon_client):
         async def _no_scope_user():
-            return make_customer(scopes=["venues:read"])  # no bookings scope at all
+            return NO_BOOKING_SCOPE_USER
 
         anon_app.dependency_overrides[get_current_user] = _no_scope_user
-        with TestClient(anon_app) as c:
-            resp = c.get("/bookings")
+        resp = anon_client.get("/bookings")
         assert resp.status_code == 403
 
 
@@ -110,67 +184,79 @@ class TestListBookings:
 
 
 class TestCreateBooking:
-    def _mock_vc(self, venue_status: str = "active") -> MagicMock:
-        mock_vc = MagicMock()
-        mock_vc.get_venue = AsyncMock(return_value=venue_dict(status=venue_status))
-        mock_vc.get_unavailabilities = AsyncMock(return_value=[])
-        return mock_vc
-
-    def test_success_returns_201(self, client_factory):
-        client = client_factory(make_customer(), venues_client=self._mock_vc())
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.create_booking = AsyncMock(return_value=booking_response())
-            resp = client.post("/bookings", json=booking_create_payload())
+    @pytest.fixture()
+    def venue_mock(self):
+        """
+        `venue_mock(status)` → shared VenuesClient mock serving a venue with
+        that status (None: venue not found), with its call history cleared.
+        """
+
+        def _get(venue_status: str | None = "active") -> MagicMock:
+            mock_vc = VENUE_CLIENTS[venue_status]
+            mock_vc.reset_mock()
+            return mock_vc
+
+        return _get
+
+    def test_success_returns_201(
+        self, client_factory, customer_user, mock_crud, venue_mock
+    ):
+        client = client_factory(customer_user, venues_client=venue_mock())
+        mock_crud.create_booking.return_value = booking_response()
+        resp = client.post("/bookings", content=CREATE_BODY, headers=JSON_HEADERS)
         assert resp.status_code == 201
-        assert resp.json()["id"] == str(BOOKING_ID)
-
-    def test_venue_id_forwarded_to_venues_client(self, client_factory):
-        mock_vc = self._mock_vc()
-        client = client_factory(make_customer(), venues_client=mock_vc)
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.create_booking = AsyncMock(return_value=booking_response())
-            client.post("/bookings", json=booking_create_payload())
-        mock_vc.get_venue.assert_awaited_once()
-        called_venue_id = mock_vc.get_venue.call_args[0][0]
-        assert str(called_venue_id) == str(VENUE_ID)
-
-    def test_venue_not_found_returns_404(self, client_factory):
-        mock_vc = MagicMock()
-        mock_vc.get_venue = AsyncMock(return_value=None)
-        client = client_factory(make_customer(), venues_client=mock_vc)
-        resp = client.post("/bookings", json=booking_create_payload())
+        assert resp.json()["id"] == BOOKING_ID_STR
+
+    def test_venue_id_forwarded_to_venues_client(
+        self, client_factory, customer_user, mock_crud, venue_mock
+    ):
+        mock_vc = venue_mock()
+        client = client_factory(customer_user, venues_client=mock_vc)
+        mock_crud.create_booking.return_value = booking_response()
+        client.post("/bookings", content=CREATE_BODY, headers=JSON_HEADERS)
+        mock_vc.get_venue_and_unavailabilities.assert_awaited_once()
+        called_venue_id = mock_vc.get_venue_and_unavailabilities.call_args[0][0]
+        assert str(called_venue_id) == VENUE_ID_STR
+
+    def test_venue_not_found_returns_404(
+        self, client_factory, customer_user, venue_mock
+    ):
+        client = client_factory(customer_user, venues_client=venue_mock(None))
+        resp = client.post("/bookings", content=CREATE_BODY, headers=JSON_HEADERS)
         assert resp.status_code == 404
         assert "Venue not found" in resp.json()["detail"]
 
-    def test_venue_not_active_returns_422(self, client_factory):
+    def test_venue_not_active_returns_422(
+        self, client_factory, customer_user, venue_mock
+    ):
         client = client_factory(
-            make_customer(), venues_client=self._mock_vc(venue_status="inactive")
+            customer_user, venues_client=venue_mock(venue_status="inactive")
         )
-        resp = client.post("/bookings", json=booking_create_payload())
+        resp = client.post("/bookings", content=CREATE_BODY, headers=JSON_HEADERS)
         assert resp.status_code == 422
         assert "not available" in resp.json()["detail"]
 
-    def test_invalid_payload_returns_422(self, client_factory):
-        client = client_factory(make_customer(), venues_client=self._mock_vc())
-        resp = client.post("/bookings", json={"venue_id": str(VENUE_ID)})
+    def test_invalid_payload_returns_422(
+        self, client_factory, customer_user, venue_mock
+    ):
+        client = client_factory(customer_user, venues_client=venue_mock())
+        resp = client.post("/bookings", json={"venue_id": VENUE_ID_STR})
         assert resp.status_code == 422
 
-    def test_end_before_start_returns_422(self, client_factory):
-        from .factories import LATER, NOW
-
-        client = client_factory(make_customer(), venues_client=self._mock_vc())
+    def test_end_before_start_returns_422(
+        self, client_factory, customer_user, venue_mock
+    ):
+        client = client_factory(customer_user, venues_client=venue_mock())
         payload = booking_create_payload(
             start_datetime=LATER.isoformat(), end_datetime=NOW.isoformat()
         )
         resp = client.post("/bookings", json=payload)
         assert resp.status_code == 422
 
-    def test_duration_too_short_returns_422(self, client_factory):
-        from datetime import timedelta
-
-        from .factories import NOW
-
-        client = client_factory(make_customer(), venues_client=self._mock_vc())
+    def test_duration_too_short_returns_422(
+        self, client_factory, customer_user, venue_mock
+    ):
+        client = client_factory(customer_user, venues_client=venue_mock())
         payload = booking_create_payload(
             start_datetime=NOW.isoformat(),
             end_datetime=(NOW + timedelta(minutes=30)).isoformat(),
@@ -178,13 +264,12 @@ class TestCreateBooking:
         resp = client.post("/bookings", json=payload)
         assert resp.status_code == 422
 
-    def test_missing_write_scope_returns_403(self, anon_app):
+    def test_missing_write_scope_returns_403(self, anon_app, anon_client):
         async def _read_only():
-            return make_customer(scopes=[BookingScope.READ])
+            return READ_ONLY_USER
 
         anon_app.dependency_overrides[get_current_user] = _read_only
-        with TestClient(anon_app) as c:
-            resp = c.post("/bookings", json=booking_create_payload())
+        resp = anon_client.post("/bookings", content=CREATE_BODY, headers=JSON_HEADERS)
         assert resp.status_code == 403
 
 
@@ -194,43 +279,36 @@ class TestCreateBooking:
 
 
 class TestGetBooking:
-    def test_customer_gets_own_booking(self, customer_client):
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=booking_response())
-            resp = customer_client.get(f"/bookings/{BOOKING_ID}")
-        assert resp.status_code == 200
-        assert resp.json()["id"] == str(BOOKING_ID)
-
-    def test_customer_cannot_see_others_booking_returns_404(self, customer_client):
-        # CRUD returns None because user_id doesn't match
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=None)
-            resp = customer_client.get(f"/bookings/{BOOKING_ID}")
-        assert resp.status_code == 404
-
-    def test_admin_can_see_any_booking(self, admin_client):
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=booking_response())
-            resp = admin_client.get(f"/bookings/{BOOKING_ID}")
-        assert resp.status_code == 200
-        # Admin path: no user_id or venue_owner_id filter
-        _, kwargs = mock_crud.get_booking.call_args
-        assert kwargs.get("user_id") is None
-        assert kwargs.get("venue_owner_id") is None
-
-    def test_venue_owner_gets_booking_for_their_venue(self, owner_client):
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=booking_response())
-            resp = owner_client.get(f"/bookings/{BOOKING_ID}")
-        assert resp.status_code == 200
+    @pytest.mark.parametrize(
+        ("client_fixture", "stored", "expected", "user_id", "venue_owner_id"),
+        [
+            ("customer_client", PENDING_BOOKING, 200, CUSTOMER_ID, None),
+            # CRUD returns None when the booking is missing or not the customer's
+            ("customer_client", None, 404, CUSTOMER_ID, None),
+            ("owner_client", PENDING_BOOKING, 200, None, VENUE_OWNER_ID),
+            ("admin_client", PENDING_BOOKING, 200, None, None),  # no filter
+        ],
+        ids=["customer-own", "customer-not-found", "owner-venue", "admin-any"],
+    )
+    def test_role_scopes_lookup(
+        self,
+        request,
+        mock_crud,
+        client_fixture,
+        stored,
+        expected,
+        user_id,
+        venue_owner_id,
+    ):
+        client = request.getfixturevalue(client_fixture)
+        mock_crud.get_booking.return_value = stored
+        resp = client.get(BOOKING_URL)
+        assert resp.status_code == expected
+        if expected == 200:
+            assert resp.json()["id"] == BOOKING_ID_STR
         _, kwargs = mock_crud.get_booking.call_args
-        assert kwargs.get("venue_owner_id") == VENUE_OWNER_ID
-
-    def test_not_found_returns_404(self, customer_client):
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=None)
-            resp = customer_client.get(f"/bookings/{BOOKING_ID}")
-        assert resp.status_code == 404
+        assert kwargs.get("user_id") == user_id
+        assert kwargs.get("venue_owner_id") == venue_owner_id
 
 
 # ---------------------------------------------------------------------------
@@ -245,180 +323,83 @@ class TestUpdateBookingStatus:
     because the router accesses .status, .user_id, .venue_owner_id attributes.
     """
 
-    def test_venue_owner_confirms_pending_booking(self, client_factory):
-        client = client_factory(make_venue_owner())
-        pending = booking_model(status="pending", venue_owner_id=str(VENUE_OWNER_ID))
-        confirmed = booking_response(status="confirmed")
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=pending)
-            mock_crud.update_booking_status = AsyncMock(return_value=confirmed)
-            resp = client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "confirmed"}
-            )
-        assert resp.status_code == 200
-        assert resp.json()["status"] == "confirmed"
-
-    def test_admin_confirms_booking(self, admin_client):
-        pending = booking_model(status="pending")
-        confirmed = booking_response(status="confirmed")
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=pending)
-            mock_crud.update_booking_status = AsyncMock(return_value=confirmed)
-            resp = admin_client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "confirmed"}
-            )
-        assert resp.status_code == 200
-
-    def test_customer_cannot_confirm_returns_403(self, client_factory):
-        client = client_factory(make_customer())
-        pending = booking_model(
-            status="pending",
-            venue_owner_id=str(VENUE_OWNER_ID),
-            user_id=str(CUSTOMER_ID),
+    def test_every_transition_target_has_permission_policy(self):
+        targets = frozenset().union(*_VALID_TRANSITIONS.values())
+        assert targets <= _PERMISSION_CHECK.keys()
+
+    @pytest.mark.parametrize(
+        ("client_fixture", "booking", "new_status", "expected"),
+        TRANSITIONS.values(),
+        ids=TRANSITIONS.keys(),
+    )
+    def test_status_transition(
+        self, request, mock_crud, client_fixture, booking, new_status, expected
+    ):
+        client = request.getfixturevalue(client_fixture)
+        mock_crud.get_booking.return_value = booking
+        mock_crud.update_booking_status.return_value = booking.model_copy(
+            update={"status": BookingStatus(new_status)}
         )
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=pending)
-            resp = client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "confirmed"}
-            )
+        resp = client.patch(BOOKING_STATUS_URL, json={"status": new_status})
+        assert resp.status_code == expected
+        if expected == 200:
+            assert resp.json()["status"] == new_status
+
+    def test_customer_cannot_confirm_returns_403(self, customer_client, mock_crud):
+        mock_crud.get_booking.return_value = PENDING_BOOKING
+        resp = customer_client.patch(BOOKING_STATUS_URL, json={"status": "confirmed"})
         assert resp.status_code == 403
 
-    def test_customer_cancels_own_booking(self, client_factory):
-        client = client_factory(make_customer())
-        pending = booking_model(
-            status="pending",
-            user_id=str(CUSTOMER_ID),
-            venue_owner_id=str(VENUE_OWNER_ID),
-        )
-        cancelled = booking_response(status="cancelled")
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=pending)
-            mock_crud.update_booking_status = AsyncMock(return_value=cancelled)
-            resp = client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "cancelled"}
-            )
-        assert resp.status_code == 200
-        assert resp.json()["status"] == "cancelled"
-
-    def test_admin_cancels_booking(self, admin_client):
-        pending = booking_model(status="pending")
-        cancelled = booking_response(status="cancelled")
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=pending)
-            mock_crud.update_booking_status = AsyncMock(return_value=cancelled)
-            resp = admin_client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "cancelled"}
-            )
+    def test_venue_owner_cancel_schedules_refund(
+        self, client_factory, owner_user, mock_crud
+    ):
+        pc = MagicMock()
+        pc.refund_booking = AsyncMock(return_value=True)
+        client = client_factory(owner_user, payments_client=pc)
+        mock_crud.get_booking.return_value = CONFIRMED_BOOKING
+        mock_crud.update_booking_status.return_value = CANCELLED_BOOKING
+        resp = client.patch(BOOKING_STATUS_URL, json={"status": "cancelled"})
         assert resp.status_code == 200
+        # TestClient runs background tasks before returning the response
+        pc.refund_booking.assert_awaited_once_with(BOOKING_ID, owner_user)
 
-    def test_venue_owner_can_refuse_pending_booking(self, client_factory):
-        """Venue owner can cancel (refuse) a pending booking for their own venue."""
-        from uuid import uuid4
-
-        client = client_factory(make_venue_owner())
-        pending = booking_model(
-            status="pending",
-            user_id=str(uuid4()),
-            venue_owner_id=str(VENUE_OWNER_ID),
-        )
-        cancelled = booking_response(status="cancelled")
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=pending)
-            mock_crud.update_booking_status = AsyncMock(return_value=cancelled)
-            resp = client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "cancelled"}
-            )
+    def test_customer_cancel_does_not_refund(
+        self, client_factory, customer_user, mock_crud
+    ):
+        pc = MagicMock()
+        pc.refund_booking = AsyncMock(return_value=True)
+        client = client_factory(customer_user, payments_client=pc)
+        mock_crud.get_booking.return_value = PENDING_BOOKING
+        mock_crud.update_booking_status.return_value = CANCELLED_BOOKING
+        resp = client.patch(BOOKING_STATUS_URL, json={"status": "cancelled"})
         assert resp.status_code == 200
-        assert resp.json()["status"] == "cancelled"
+        pc.refund_booking.assert_not_awaited()
 
     def test_venue_owner_cannot_cancel_other_venues_booking_returns_403(
-        self, client_factory
+        self, owner_client, mock_crud
     ):
         """Venue owner cannot cancel a booking belonging to a different venue."""
-        from uuid import uuid4
-
-        client = client_factory(make_venue_owner())
-        pending = booking_model(
-            status="pending",
-            user_id=str(uuid4()),
-            venue_owner_id=str(uuid4()),  # different owner
-        )
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=pending)
-            resp = client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "cancelled"}
-            )
+        mock_crud.get_booking.return_value = OTHER_VENUES_BOOKING
+        resp = owner_client.patch(BOOKING_STATUS_URL, json={"status": "cancelled"})
         assert resp.status_code == 403
 
-    def test_venue_owner_completes_confirmed_booking(self, client_factory):
-        client = client_factory(make_venue_owner())
-        confirmed = booking_model(
-            status="confirmed", venue_owner_id=str(VENUE_OWNER_ID)
-        )
-        completed = booking_response(status="completed")
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=confirmed)
-            mock_crud.update_booking_status = AsyncMock(return_value=completed)
-            resp = client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "completed"}
-            )
-        assert resp.status_code == 200
-
-    def test_venue_owner_marks_no_show(self, client_factory):
-        client = client_factory(make_venue_owner())
-        confirmed = booking_model(
-            status="confirmed", venue_owner_id=str(VENUE_OWNER_ID)
-        )
-        no_show = booking_response(status="no_show")
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=confirmed)
-            mock_crud.update_booking_status = AsyncMock(return_value=no_show)
-            resp = client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "no_show"}
-            )
-        assert resp.status_code == 200
-
-    def test_invalid_transition_from_cancelled_returns_400(self, admin_client):
-        cancelled = booking_model(status="cancelled")
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=cancelled)
-            resp = admin_client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "confirmed"}
-            )
-        assert resp.status_code == 400
-
-    def test_invalid_transition_from_completed_returns_400(self, admin_client):
-        completed = booking_model(status="completed")
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=completed)
-            resp = admin_client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "confirmed"}
-            )
-        assert resp.status_code == 400
-
-    def test_booking_not_found_returns_404(self, admin_client):
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=None)
-            resp = admin_client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "confirmed"}
-            )
+    def test_booking_not_found_returns_404(self, admin_client, mock_crud):
+        mock_crud.get_booking.return_value = None
+        resp = admin_client.patch(BOOKING_STATUS_URL, json={"status": "confirmed"})
         assert resp.status_code == 404
 
-    def test_update_crud_returns_none_gives_404(self, admin_client):
-        """Edge case: booking disappears between get and update (race condition)."""
-        pending = booking_model(status="pending")
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=pending)
-            mock_crud.update_booking_status = AsyncMock(return_value=None)
-            resp = admin_client.patch(
-                f"/bookings/{BOOKING_ID}/status", json={"status": "confirmed"}
-            )
-        assert resp.status_code == 404
+    def test_concurrent_status_change_returns_409(self, admin_client, mock_crud):
+        """Edge case: status changes between get and the guarded update (race)."""
+        mock_crud.get_booking.return_value = PENDING_BOOKING
+        mock_crud.update_booking_status.return_value = None
+        resp = admin_client.patch(BOOKING_STATUS_URL, json={"status": "confirmed"})
+        assert resp.status_code == 409
+        mock_crud.update_booking_status.assert_awaited_once_with(
+            PENDING_BOOKING, BookingStatus.CONFIRMED
+        )
 
     def test_invalid_status_value_returns_422(self, admin_client):
-        resp = admin_client.patch(
-            f"/bookings/{BOOKING_ID}/status", json={"status": "flying"}
-        )
+        resp = admin_client.patch(BOOKING_STATUS_URL, json={"status": "flying"})
         assert resp.status_code == 422
 
 
@@ -428,99 +409,149 @@ class TestUpdateBookingStatus:
 
 
 class TestEnrichment:
-    def _mock_vc(self, venues: list[dict] | None = None):
-        mock = MagicMock()
-        mock.get_by_ids = AsyncMock(return_value=venues or [])
-        mock.get_venue = AsyncMock(return_value=None)
-        mock.get_unavailabilities = AsyncMock(return_value=[])
-        return mock
-
-    def _mock_uc(self, users: list[dict] | None = None):
-        mock = MagicMock()
-        mock.get_by_ids = AsyncMock(return_value=users or [])
-        return mock
-
-    def test_list_returns_venue_name(self, client_factory):
-        vc = self._mock_vc([venue_dict(name="My Court")])
-        uc = self._mock_uc()
-        client = client_factory(make_customer(), venues_client=vc, users_client=uc)
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[booking_response()])
-            resp = client.get("/bookings")
+    @pytest.fixture(scope="class")
+    @classmethod
+    def _lookup_mocks(cls) -> tuple[MagicMock, MagicMock]:
+        vc, uc = MagicMock(), MagicMock()
+        vc.get_by_ids = AsyncMock()
+        uc.get_by_ids = AsyncMock()
+        return vc, uc
+
+    @pytest.fixture()
+    def lookups(self, _lookup_mocks, client_factory, customer_user, mock_crud):
+        """
+        Customer client wired to the class's venue/user lookup mocks. Set
+        `vc.get_by_ids.return_value` / `uc.get_by_ids.return_value` per test;
+        both default to no matches.
+        """
+        vc, uc = _lookup_mocks
+        for mock in (vc, uc):
+            mock.reset_mock()
+            mock.get_by_ids.return_value = {}
+        client = client_factory(customer_user, venues_client=vc, users_client=uc)
+        return client, vc, uc
+
+    @pytest.mark.parametrize(
+        ("venue_names", "user_names", "expected"),
+        [
+            ({VENUE_ID: "My Court"}, {}, {"venue_name": "My Court"}),
+            (
+                {},
+                {CUSTOMER_ID: ("johndoe", "John Doe")},
+                {"customer_username": "johndoe", "customer_full_name": "John Doe"},
+            ),
+            (
+                {},
+                {VENUE_OWNER_ID: ("owner42", "Test User")},
+                {"owner_username": "owner42"},
+            ),
+            (
+                {},
+                {},
+                {"venue_name": None, "customer_username": None, "owner_username": None},
+            ),
+        ],
+        ids=["venue-name", "customer-username", "owner-username", "upstream-empty"],
+    )
+    def test_list_enrichment(
+        self, lookups, mock_crud, venue_names, user_names, expected
+    ):
+        client, vc, uc = lookups
+        vc.get_by_ids.return_value = venue_names
+        uc.get_by_ids.return_value = user_names
+        mock_crud.list_bookings.return_value = [PENDING_BOOKING]
+        resp = client.get("/bookings")
         assert resp.status_code == 200
-        assert resp.json()[0]["venue_name"] == "My Court"
-
-    def test_list_returns_customer_username(self, client_factory):
-        vc = self._mock_vc()
-        uc = self._mock_uc(
-            [user_dict(user_id=CUSTOMER_ID, username="johndoe", full_name="John Doe")]
-        )
-        client = client_factory(make_customer(), venues_client=vc, users_client=uc)
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[booking_response()])
-            resp = client.get("/bookings")
-        data = resp.json()[0]
-        assert data["customer_username"] == "johndoe"
-        assert data["customer_full_name"] == "John Doe"
-
-    def test_list_returns_owner_username(self, client_factory):
-        vc = self._mock_vc()
-        uc = self._mock_uc(
-            [user_dict(user_id=VENUE_OWNER_ID, username="owner42")]
-        )
-        client = client_factory(make_customer(), venues_client=vc, users_client=uc)
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[booking_response()])
-            resp = client.get("/bookings")
-        assert resp.json()[0]["owner_username"] == "owner42"
-
-    def test_enrichment_fields_null_when_upstream_empty(self, client_factory):
-        client = client_factory(make_customer())  # uses noop mocks → empty lists
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[booking_response()])
-            resp = client.get("/bookings")
         data = resp.json()[0]
-        assert data["venue_name"] is None
-        assert data["customer_username"] is None
-        assert data["owner_username"] is None
-
-    def test_get_booking_returns_enriched(self, client_factory):
-        vc = self._mock_vc([venue_dict(name="Stadium A")])
-        uc = self._mock_uc([user_dict(user_id=CUSTOMER_ID, username="alice")])
-        client = client_factory(make_customer(), venues_client=vc, users_client=uc)
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.get_booking = AsyncMock(return_value=booking_response())
-            resp = client.get(f"/bookings/{BOOKING_ID}")
+        assert {field: data[field] for field in expected} == expected
+
+    def test_get_booking_returns_enriched(self, lookups, mock_crud):
+        client, vc, uc = lookups
+        vc.get_by_ids.return_value = {VENUE_ID: "Stadium A"}
+        uc.get_by_ids.return_value = {CUSTOMER_ID: ("alice", "Test User")}
+        mock_crud.get_booking.return_value = PENDING_BOOKING
+        resp = client.get(BOOKING_URL)
         assert resp.status_code == 200
         data = resp.json()
         assert data["venue_name"] == "Stadium A"
         assert data["customer_username"] == "alice"
 
 
+# ---------------------------------------------------------------------------
+# GET /bookings/slots — ETag revalidation
+# ---------------------------------------------------------------------------
+
+
+class TestVenueSlots:
+    SLOTS_PATH = f"/bookings/slots?venue_id={VENUE_ID}"
+
+    def _slot(self) -> BookingSlot:
+        return BookingSlot(start_datetime=NOW, end_datetime=LATER)
+
+    def test_cache_miss_returns_slots_with_etag(self, customer_client, mock_crud):
+        set_cache = AsyncMock()
+        with (
+            patch.object(
+                booking_module, "get_slots_cache", AsyncMock(return_value=None)
+            ),
+            patch.object(booking_module, "set_slots_cache", set_cache),
+        ):
+            mock_crud.list_occupied_slots.return_value = [self._slot()]
+            resp = customer_client.get(self.SLOTS_PATH)
+        assert resp.status_code == 200
+        assert len(resp.json()) == 1
+        set_cache.assert_awaited_once_with(VENUE_ID, resp.headers["ETag"], resp.content)
+
+    def test_cache_hit_returns_stored_body_as_is(self, customer_client, mock_crud):
+        body = b'[{"start_datetime":"cached","end_datetime":"cached"}]'
+        with patch.object(
+            booking_module, "get_slots_cache", AsyncMock(return_value=('"abc"', body))
+        ):
+            resp = customer_client.get(self.SLOTS_PATH)
+        assert resp.status_code == 200
+        assert resp.content == body
+        assert resp.headers["ETag"] == '"abc"'
+        assert resp.headers["content-type"] == "application/json"
+        mock_crud.list_occupied_slots.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "if_none_match",
+        ['"abc"', 'W/"abc"', '"old", W/"abc"'],
+        ids=["strong", "weak", "list"],
+    )
+    def test_matching_if_none_match_returns_304(self, customer_client, if_none_match):
+        with patch.object(
+            booking_module, "get_slots_cache", AsyncMock(return_value=('"abc"', b"[]"))
+        ):
+            resp = customer_client.get(
+                self.SLOTS_PATH, headers={"If-None-Match": if_none_match}
+            )
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["ETag"] == '"abc"'
+
+
 # ---------------------------------------------------------------------------
 # DELETE /bookings/{id}
 # ---------------------------------------------------------------------------
 
 
 class TestDeleteBooking:
-    def test_admin_can_delete(self, admin_client):
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.delete_booking = AsyncMock(return_value=True)
-            resp = admin_client.delete(f"/bookings/{BOOKING_ID}")
+    def test_admin_can_delete(self, admin_client, mock_crud):
+        mock_crud.delete_booking.return_value = True
+        resp = admin_client.delete(BOOKING_URL)
         assert resp.status_code == 204
         mock_crud.delete_booking.assert_awaited_once_with(BOOKING_ID)
 
-    def test_admin_delete_not_found_returns_404(self, admin_client):
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.delete_booking = AsyncMock(return_value=False)
-            resp = admin_client.delete(f"/bookings/{BOOKING_ID}")
+    def test_admin_delete_not_found_returns_404(self, admin_client, mock_crud):
+        mock_crud.delete_booking.return_value = False
+        resp = admin_client.delete(BOOKING_URL)
         assert resp.status_code == 404
 
-    def test_non_admin_gets_403(self, anon_app):
+    def test_non_admin_gets_403(self, anon_app, anon_client):
         async def _customer():
-            return make_customer()
+            return CUSTOMER
 
         anon_app.dependency_overrides[get_current_user] = _customer
-        with TestClient(anon_app) as c:
-            resp = c.delete(f"/bookings/{BOOKING_ID}")
+        resp = anon_client.delete(BOOKING_URL)
         assert resp.status_code == 403
@@ -0,0 +1,86 @@
+"""
+Tests for app/crud.py against a real in-memory SQLite database.
+The router tests mock booking_crud, so the query and pricing logic is
+covered here.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from tortoise import Tortoise
+
+from app.crud import booking_crud
+from app.models import Booking, BookingStatus
+from app.schemas import Unavailabilities
+
+from .factories import CUSTOMER_ID, NOW, VENUE_ID, VENUE_OWNER_ID
+
+
+@pytest.fixture(scope="module", autouse=True)
+async def _db():
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.models"]})
+    await Tortoise.generate_schemas()
+    yield
+    await Tortoise.close_connections()
+
+
+@pytest.fixture(autouse=True)
+async def _empty_bookings(_db):
+    await Booking.all().delete()
+
+
+async def _create_booking(duration: timedelta, price_per_hour: str):
+    return await booking_crud.create_booking(
+        venue_id=VENUE_ID,
+        venue_owner_id=VENUE_OWNER_ID,
+        user_id=CUSTOMER_ID,
+        start_datetime=NOW,
+        end_datetime=NOW + duration,
+        price_per_hour=Decimal(price_per_hour),
+        currency="EUR",
+        notes=None,
+        unavailabilities=Unavailabilities(),
+    )
+
+
+class TestCreateBookingPrice:
+    @pytest.mark.parametrize(
+        ("duration", "price_per_hour", "expected"),
+        [
+            pytest.param(timedelta(minutes=45), "10.00", "7.50", id="45min"),
+            # 10.05 / 2 is exactly 5.025: ROUND_HALF_UP gives 5.03 where the
+            # Decimal default (ROUND_HALF_EVEN) would give 5.02.
+            pytest.param(timedelta(minutes=30), "10.05", "5.03", id="half-cent"),
+        ],
+    )
+    async def test_total_price(self, duration, price_per_hour, expected):
+        booking = await _create_booking(duration, price_per_hour)
+        assert booking.total_price == Decimal(expected)
+
+
+class TestUpdateBookingStatus:
+    async def test_applies_when_status_unchanged(self):
+        booking = await _create_booking(timedelta(hours=1), "10.00")
+        updated = await booking_crud.update_booking_status(
+            booking, BookingStatus.CONFIRMED
+        )
+        assert updated is not None
+        assert updated.status == BookingStatus.CONFIRMED
+        row = await Booking.get(id=booking.id)
+        assert row.status == BookingStatus.CONFIRMED
+
+    async def test_stale_status_is_rejected(self):
+        booking = await _create_booking(timedelta(hours=1), "10.00")
+        await booking_crud.update_booking_status(booking, BookingStatus.CONFIRMED)
+        row_before = await Booking.filter(id=booking.id).values()
+
+        # `booking` still says pending, as a concurrent PATCH would have seen it
+        stale = await booking_crud.update_booking_status(
+            booking, BookingStatus.CANCELLED
+        )
+
+        assert stale is None
+        assert await Booking.filter(id=booking.id).values() == row_before
@@ -5,181 +5,332 @@ These tests use the real dep functions (no overrides) to get coverage.
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from fastapi import Depends, FastAPI
-from fastapi.testclient import TestClient
+import httpx
+import pytest
+from fastapi import Depends, HTTPException
 
+from app import deps as deps_module
 from app.deps import (
+    CurrentUser,
+    UsersClient,
     VenuesClient,
     can_read_or_manage_booking,
+    close_http_clients,
     get_current_user,
+    get_user_caps,
     get_venues_client,
 )
-from app.routers.booking import router
+from app.schemas import Unavailabilities
+
+from .factories import (
+    ADMIN,
+    ADMIN_ID,
+    BOOKING_URL,
+    CUSTOMER,
+    CUSTOMER_ID,
+    CUSTOMER_ID_STR,
+    VENUE_ID,
+    VENUE_OWNER,
+    make_customer,
+    unavailability_dict,
+    user_dict,
+    venue_dict,
+)
+
+NO_BOOKING_SCOPE_USER = make_customer(scopes=["venues:read"])
 
-from .factories import CUSTOMER_ID, make_customer, make_venue_owner
 
-CRUD_PATH = "app.routers.booking.booking_crud"
+async def _scope_passthrough(user=Depends(get_current_user)):
+    return user
 
 
-def _make_anon_app_with_scope_passthrough() -> FastAPI:
+@pytest.fixture()
+def passthrough_app(anon_app):
     """
-    App that uses the real get_current_user dep but ignores scope checks
-    (scope check is replaced with a passthrough that still calls get_current_user).
+    Session anon app using the real get_current_user dep but ignoring scope
+    checks (scope check is replaced with a passthrough that still calls
+    get_current_user).
     """
-    app = FastAPI()
-    app.include_router(router)
-
-    async def _passthrough(user=Depends(get_current_user)):
-        return user
-
-    app.dependency_overrides[can_read_or_manage_booking] = _passthrough
-    return app
+    anon_app.dependency_overrides[can_read_or_manage_booking] = _scope_passthrough
+    return anon_app
 
 
 class TestGetCurrentUser:
-    def test_valid_headers_authenticate(self):
+    def test_valid_headers_authenticate(self, passthrough_app, mock_crud, anon_client):
         """get_current_user reads Traefik headers and returns CurrentUser."""
-        app = _make_anon_app_with_scope_passthrough()
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[])
-            with TestClient(app) as c:
-                resp = c.get(
-                    "/bookings",
-                    headers={
-                        "X-User-Id": str(CUSTOMER_ID),
-                        "X-Username": "customer1",
-                        "X-User-Scopes": "bookings:read",
-                    },
-                )
+        mock_crud.list_bookings.return_value = []
+        resp = anon_client.get(
+            "/bookings",
+            headers={
+                "X-User-Id": CUSTOMER_ID_STR,
+                "X-Username": "customer1",
+                "X-User-Scopes": "bookings:read",
+            },
+        )
         assert resp.status_code == 200
 
-    def test_invalid_user_id_returns_401(self):
+    def test_invalid_user_id_returns_401(self, passthrough_app, anon_client):
         """get_current_user raises 401 when X-User-Id is not a valid UUID."""
-        app = _make_anon_app_with_scope_passthrough()
-        with TestClient(app) as c:
-            resp = c.get(
-                "/bookings",
-                headers={
-                    "X-User-Id": "not-a-uuid",
-                    "X-Username": "customer1",
-                    "X-User-Scopes": "",
-                },
-            )
+        resp = anon_client.get(
+            "/bookings",
+            headers={
+                "X-User-Id": "not-a-uuid",
+                "X-Username": "customer1",
+                "X-User-Scopes": "",
+            },
+        )
         assert resp.status_code == 401
 
-    def test_empty_scopes_string_parsed_as_empty_list(self):
-        """X-User-Scopes: '' should produce scopes=[]."""
-        app = _make_anon_app_with_scope_passthrough()
+    def test_empty_scopes_string_parsed_as_empty_set(
+        self, anon_app, mock_crud, anon_client
+    ):
+        """X-User-Scopes: '' should produce an empty scope set."""
         captured = {}
 
         async def _capture(user=Depends(get_current_user)):
             captured["user"] = user
             return user
 
-        app.dependency_overrides[can_read_or_manage_booking] = _capture
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[])
-            with TestClient(app) as c:
-                c.get(
-                    "/bookings",
-                    headers={
-                        "X-User-Id": str(CUSTOMER_ID),
-                        "X-Username": "u",
-                        "X-User-Scopes": "",
-                    },
-                )
-        assert captured["user"].scopes == []
+        anon_app.dependency_overrides[can_read_or_manage_booking] = _capture
+        mock_crud.list_bookings.return_value = []
+        anon_client.get(
+            "/bookings",
+            headers={
+                "X-User-Id": CUSTOMER_ID_STR,
+                "X-Username": "u",
+                "X-User-Scopes": "",
+            },
+        )
+        assert captured["user"].scopes == frozenset()
+
+    async def test_percent_encoded_username_is_decoded(self):
+        """Usernames containing '%' escapes are decoded; plain ones pass through."""
+        user = await get_current_user(
+            x_user_id=CUSTOMER_ID_STR, x_username="j%C3%B6rg", x_user_scopes=""
+        )
+        assert user.username == "jörg"
+
+        user = await get_current_user(
+            x_user_id=CUSTOMER_ID_STR, x_username="customer1", x_user_scopes=""
+        )
+        assert user.username == "customer1"
 
 
 class TestCanReadOrManageBooking:
-    def _app_for(self, current_user) -> FastAPI:
-        app = FastAPI()
-        app.include_router(router)
-
+    @staticmethod
+    def _as(app, current_user):
         async def _user():
             return current_user
 
         app.dependency_overrides[get_current_user] = _user
-        return app
-
-    def test_customer_with_read_scope_passes(self):
-        app = self._app_for(make_customer())
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[])
-            with TestClient(app) as c:
-                resp = c.get("/bookings")
+
+    def test_customer_with_read_scope_passes(self, anon_app, mock_crud, anon_client):
+        self._as(anon_app, CUSTOMER)
+        mock_crud.list_bookings.return_value = []
+        resp = anon_client.get("/bookings")
         assert resp.status_code == 200
 
-    def test_venue_owner_with_manage_scope_passes(self):
-        app = self._app_for(make_venue_owner())
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.list_bookings = AsyncMock(return_value=[])
-            with TestClient(app) as c:
-                resp = c.get("/bookings")
+    def test_venue_owner_with_manage_scope_passes(
+        self, anon_app, mock_crud, anon_client
+    ):
+        self._as(anon_app, VENUE_OWNER)
+        mock_crud.list_bookings.return_value = []
+        resp = anon_client.get("/bookings")
         assert resp.status_code == 200
 
-    def test_user_with_no_relevant_scope_gets_403(self):
-        app = self._app_for(make_customer(scopes=["venues:read"]))
-        with TestClient(app) as c:
-            resp = c.get("/bookings")
+    def test_user_with_no_relevant_scope_gets_403(self, anon_app, anon_client):
+        self._as(anon_app, NO_BOOKING_SCOPE_USER)
+        resp = anon_client.get("/bookings")
         assert resp.status_code == 403
 
 
 class TestGetVenuesClient:
-    def test_returns_venues_client_instance(self):
-        client = get_venues_client()
+    async def test_returns_venues_client_instance(self):
+        client = await get_venues_client()
         assert isinstance(client, VenuesClient)
 
-    def test_same_instance_returned_each_time(self):
+    async def test_same_instance_returned_each_time(self):
         """get_venues_client returns the module-level singleton."""
-        assert get_venues_client() is get_venues_client()
+        assert await get_venues_client() is await get_venues_client()
 
     def test_headers_built_from_current_user(self):
+        user = CUSTOMER
+        headers = user.traefik_headers
+        assert headers["X-User-Id"] == str(user.id).encode()
+        assert headers["X-Username"] == user.username.encode()
+        assert b"bookings:read" in headers["X-User-Scopes"].split()
+
+    def test_headers_memoized_per_user(self):
         user = make_customer()
-        client = VenuesClient()
-        headers = client._headers(user)
-        assert headers["X-User-Id"] == str(user.id)
-        assert headers["X-Username"] == user.username
-        assert "bookings:read" in headers["X-User-Scopes"]
+        assert user.traefik_headers is user.traefik_headers
 
-    def test_client_property_returns_async_client(self):
-        """Accessing ._client triggers the lru_cache factory."""
-        import httpx
+    @pytest.fixture()
+    async def venues_client(self):
+        """VenuesClient whose cached httpx client is closed after the test."""
+        yield VenuesClient()
+        await close_http_clients()
 
-        client = VenuesClient()
-        http_client = client._client
+    async def test_client_property_returns_async_client(self, venues_client):
+        """Accessing ._client triggers the lru_cache factory."""
+        http_client = venues_client._client
         assert isinstance(http_client, httpx.AsyncClient)
+        assert VenuesClient()._client is http_client
+
+
+class TestGetByIds:
+    """Bulk lookups return UUID-keyed maps ready for enrichment."""
+
+    async def test_venues_mapped_to_names(self):
+        http = MagicMock()
+        http.get = AsyncMock(
+            return_value=httpx.Response(200, json=[venue_dict(name="My Court")])
+        )
+        with patch.object(deps_module, "_get_http_client", return_value=http):
+            result = await VenuesClient().get_by_ids({VENUE_ID}, CUSTOMER)
+        assert result == {VENUE_ID: "My Court"}
+
+    async def test_users_mapped_to_name_fields(self):
+        http = MagicMock()
+        http.get = AsyncMock(
+            return_value=httpx.Response(
+                200, json=[user_dict(username="alice", full_name="Alice A")]
+            )
+        )
+        with patch.object(deps_module, "_get_http_client", return_value=http):
+            result = await UsersClient().get_by_ids({CUSTOMER_ID}, CUSTOMER)
+        assert result == {CUSTOMER_ID: ("alice", "Alice A")}
+
+    async def test_upstream_error_returns_empty_map(self):
+        http = MagicMock()
+        http.get = AsyncMock(return_value=httpx.Response(500))
+        with patch.object(deps_module, "_get_http_client", return_value=http):
+            result = await VenuesClient().get_by_ids({VENUE_ID}, CUSTOMER)
+        assert result == {}
+
+
+class TestGetUnavailabilitiesCache:
+    async def test_cache_hit_skips_venues_ms(self):
+        windows = Unavailabilities.from_windows([unavailability_dict()])
+        http = MagicMock()
+        http.get = AsyncMock()
+        with (
+            patch.object(
+                deps_module,
+                "get_unavailabilities_cache",
+                AsyncMock(return_value=windows),
+            ),
+            patch.object(deps_module, "_get_http_client", return_value=http),
+        ):
+            result = await VenuesClient().get_unavailabilities(VENUE_ID, CUSTOMER)
+        assert result is windows
+        http.get.assert_not_awaited()
+
+    async def test_cache_miss_fetches_and_stores(self):
+        http = MagicMock()
+        http.get = AsyncMock(
+            return_value=httpx.Response(200, json=[unavailability_dict()])
+        )
+        set_cache = AsyncMock()
+        with (
+            patch.object(
+                deps_module, "get_unavailabilities_cache", AsyncMock(return_value=None)
+            ),
+            patch.object(deps_module, "set_unavailabilities_cache", set_cache),
+            patch.object(deps_module, "_get_http_client", return_value=http),
+        ):
+            result = await VenuesClient().get_unavailabilities(VENUE_ID, CUSTOMER)
+        assert result == Unavailabilities.from_windows([unavailability_dict()])
+        set_cache.assert_awaited_once_with(VENUE_ID, result)
+
+
+class TestGetVenueAndUnavailabilities:
+    """The combined fetch runs both calls concurrently but keeps 404 precedence."""
+
+    async def test_returns_venue_and_windows(self):
+        windows = Unavailabilities.from_windows([unavailability_dict()])
+        with (
+            patch.object(
+                VenuesClient, "get_venue", AsyncMock(return_value=venue_dict())
+            ),
+            patch.object(
+                VenuesClient, "get_unavailabilities", AsyncMock(return_value=windows)
+            ),
+        ):
+            venue, result = await VenuesClient().get_venue_and_unavailabilities(
+                VENUE_ID, CUSTOMER
+            )
+        assert venue == venue_dict()
+        assert result is windows
+
+    async def test_missing_venue_discards_unavailabilities_error(self):
+        error = HTTPException(status_code=502, detail="venues-ms returned 404")
+        with (
+            patch.object(VenuesClient, "get_venue", AsyncMock(return_value=None)),
+            patch.object(
+                VenuesClient, "get_unavailabilities", AsyncMock(side_effect=error)
+            ),
+        ):
+            venue, result = await VenuesClient().get_venue_and_unavailabilities(
+                VENUE_ID, CUSTOMER
+            )
+        assert venue is None
+        assert result == Unavailabilities()
+
+    async def test_unavailabilities_error_raised_for_existing_venue(self):
+        error = HTTPException(status_code=502, detail="venues-ms returned 500")
+        with (
+            patch.object(
+                VenuesClient, "get_venue", AsyncMock(return_value=venue_dict())
+            ),
+            patch.object(
+                VenuesClient, "get_unavailabilities", AsyncMock(side_effect=error)
+            ),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            await VenuesClient().get_venue_and_unavailabilities(VENUE_ID, CUSTOMER)
+        assert exc_info.value is error
 
 
 class TestCurrentUserIsAdmin:
     def test_is_admin_true_when_has_admin_scope(self):
-        from uuid import uuid4
-
-        from app.deps import CurrentUser
-
-        user = CurrentUser(id=uuid4(), username="admin", scopes=["admin:scopes"])
+        user = CurrentUser(id=ADMIN_ID, username="admin", scopes=["admin:scopes"])
         assert user.is_admin is True
 
     def test_is_admin_false_without_admin_scope(self):
-        assert make_customer().is_admin is False
+        assert CUSTOMER.is_admin is False
+
+
+class TestGetUserCaps:
+    async def test_customer_caps(self):
+        caps = await get_user_caps(CUSTOMER)
+        assert caps.is_reader and caps.has_cancel
+        assert not (caps.is_manager or caps.is_admin_read or caps.is_admin_write)
+
+    async def test_owner_is_manager(self):
+        caps = await get_user_caps(VENUE_OWNER)
+        assert caps.is_manager
+        assert not caps.is_admin_write
+
+    async def test_admin_has_read_and_write(self):
+        caps = await get_user_caps(ADMIN)
+        assert caps.is_admin_read and caps.is_admin_write
 
 
 class TestRequireScopesHappyPath:
-    def test_delete_endpoint_passes_with_admin_delete_scope(self, anon_app):
+    def test_delete_endpoint_passes_with_admin_delete_scope(
+        self, anon_app, mock_crud, anon_client
+    ):
         """
         Tests the require_scopes happy path (line 74: return current_user).
         Uses the real can_admin_delete_booking dep with a user that has the scope.
         """
-        from .factories import BOOKING_ID, make_admin
 
         async def _admin():
-            return make_admin()
+            return ADMIN
 
         anon_app.dependency_overrides[get_current_user] = _admin
-        with patch(CRUD_PATH) as mock_crud:
-            mock_crud.delete_booking = AsyncMock(return_value=True)
-            with TestClient(anon_app) as c:
-                resp = c.delete(f"/bookings/{BOOKING_ID}")
+        mock_crud.delete_booking.return_value = True
+        resp = anon_client.delete(BOOKING_URL)
         assert resp.status_code == 204
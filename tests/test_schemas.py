@@ -0,0 +1,91 @@
+"""Tests for schema helpers that carry logic — Unavailabilities, keyset cursors."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+from app.schemas import (
+    BookingEnriched,
+    BookingResponse,
+    Unavailabilities,
+    decode_cursor,
+    encode_cursor,
+)
+
+from .factories import BOOKING_ID, LATER, NOW, booking_response, unavailability_dict
+
+
+class TestUnavailabilities:
+    def test_empty_never_overlaps(self):
+        assert Unavailabilities().overlaps(NOW, LATER) is False
+
+    def test_windows_sorted_by_start(self):
+        windows = Unavailabilities.from_windows(
+            [
+                unavailability_dict(LATER, LATER + timedelta(hours=1)),
+                unavailability_dict(NOW, NOW + timedelta(hours=1)),
+            ]
+        )
+        assert list(windows.starts) == sorted(windows.starts)
+
+    def test_overlapping_span_detected(self):
+        windows = Unavailabilities.from_windows([unavailability_dict(NOW, LATER)])
+        assert windows.overlaps(NOW + timedelta(hours=1), LATER + timedelta(hours=1))
+
+    def test_adjacent_span_does_not_overlap(self):
+        windows = Unavailabilities.from_windows([unavailability_dict(NOW, LATER)])
+        assert not windows.overlaps(LATER, LATER + timedelta(hours=1))
+        assert not windows.overlaps(NOW - timedelta(hours=1), NOW)
+
+    def test_long_earlier_window_still_detected(self):
+        """A long window that starts first must not be hidden by a later short one."""
+        windows = Unavailabilities.from_windows(
+            [
+                unavailability_dict(NOW, NOW + timedelta(days=1)),
+                unavailability_dict(NOW + timedelta(hours=1), LATER),
+            ]
+        )
+        start = NOW + timedelta(hours=5)
+        assert windows.overlaps(start, start + timedelta(hours=1))
+
+    def test_naive_strings_treated_as_utc(self):
+        windows = Unavailabilities.from_windows(
+            [
+                {
+                    "start_datetime": NOW.replace(tzinfo=None).isoformat(),
+                    "end_datetime": LATER.replace(tzinfo=None).isoformat(),
+                }
+            ]
+        )
+        assert windows.overlaps(NOW, LATER)
+
+
+class TestCursor:
+    def test_round_trip(self):
+        assert decode_cursor(encode_cursor(NOW, BOOKING_ID)) == (NOW, BOOKING_ID)
+
+    @pytest.mark.parametrize("cursor", ["", "not-base64!", "bm8tc2VwYXJhdG9y"])
+    def test_malformed_cursor_raises_value_error(self, cursor):
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            decode_cursor(cursor)
+
+
+class TestBookingEnriched:
+    def test_from_booking_copies_fields_and_names(self):
+        booking = BookingResponse(**booking_response())
+        enriched = BookingEnriched.from_booking(
+            booking,
+            venue_name="My Court",
+            customer=("alice", "Alice A"),
+            owner=(None, None),
+        )
+        assert enriched.model_dump() == {
+            **booking.model_dump(),
+            "venue_name": "My Court",
+            "customer_username": "alice",
+            "customer_full_name": "Alice A",
+            "owner_username": None,
+            "owner_full_name": None,
+        }